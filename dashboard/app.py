@@ -1,8 +1,25 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime
+import functools
+import os
+import time
+import uuid
 import plotly.express as px
-from utils import apply_custom_css, load_data, render_top_header
+import plotly.graph_objects as go
+from utils import apply_custom_css, render_top_header
+import query
+from data_access import (DATA_DIR, get_feature_store, get_rows, get_rule_patterns, get_score_ladder, get_table, get_timeline,
+                         load_summary, range_positions, sorted_index, tables_available)
+from hris.core.event_log import fold_segment, load_checkpoint, read_segments
+from hris.analysis.summaries import hour_amount_density, scatter_density
+from hris.core.engine import HIGH_RISK_CUTOFF
+from hris.reporting.capacity import DEFAULT_REVIEW_CAPACITY, LADDER_SCOPES
+from hris.core.cube import CREDIT_SUM_COLUMNS, TRANSACTION_DIMS, build_credit_cube, build_transaction_cube, slice_cube
+from hris.core.segments import assign_risk_segment
+from hris.reporting.dashboard_prep import dashboard_kpis
+from hris.reporting.whatif import BAND_LABELS, band_counts
 
 
 st.set_page_config(
@@ -14,6 +31,23 @@ st.set_page_config(
 
 apply_custom_css()
 
+CREDIT_CENTER_COLUMNS = ['MonthlyIncome', 'debt_to_income_ratio', 'credit_risk_score', 'risk_band', 'LoanAmount',
+                         'SeriousDlqin2yrs']
+CREDIT_CUBE_COLUMNS = sorted(set(CREDIT_SUM_COLUMNS) | {'risk_band', 'credit_risk_score', 'SeriousDlqin2yrs',
+                                                        'NumberOfTimes90DaysLate'})
+REGISTRY_COLUMNS = ['Time', 'Amount', 'MerchantCategory', 'fraud_risk_score']
+SCATTER_POINT_LIMIT = 5000
+EXPORT_DIR = os.path.join(DATA_DIR, 'exports')
+EXPORT_DOWNLOAD_LIMIT = 200 * 1024 * 1024
+EXPORT_RETENTION_SECONDS = 24 * 3600
+EXPORT_COLUMNS = ['Time', 'CustomerID', 'Amount', 'MerchantCategory', 'City', 'fraud_risk_score', 'risk_band',
+                  'risk_reason_summary']
+LIVE_REFRESH_SECONDS = 5
+LIVE_HISTORY_SEGMENTS = 100
+RISK_BAND_COLORS = {'High Risk':'#C62828', 'Medium Risk':'#ED6C02', 'Low Risk':'#2E7D32'}
+HYBRID_STATUS_COLORS = {'Hypersensitive':'#C62828', 'Moderate':'#ED6C02', 'Standard':'#2E7D32'}
+HYBRID_LAB_COLUMNS = ['CustomerID', 'credit_risk_score', 'fraud_risk_score', 'hybrid_risk_score', 'hybrid_risk_status']
+
 
 def update_chart_layout(fig):
     fig.update_layout(
@@ -49,15 +83,54 @@ def update_chart_layout(fig):
 
 
 
-def render_executive_core(credit_df, fraud_df, hybrid_df):
+def density_scatter(df, x, y, color, color_map, size=None, x_range=None):
+    if len(df) <= SCATTER_POINT_LIMIT:
+        fig = px.scatter(df, x=x, y=y, color=color, size=size, color_discrete_map=color_map, render_mode='webgl')
+        if x_range is not None:
+            fig.update_layout(xaxis_range=list(x_range))
+        return fig
+
+    counts, x_edges, y_edges, outliers = scatter_density(df[x], df[y], x_range=x_range)
+    fig = go.Figure(go.Heatmap(x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+                               z=np.where(counts.T > 0, counts.T, np.nan), colorscale='Blues',
+                               colorbar=dict(title='count')))
+    for label, group in df.iloc[outliers].groupby(color):
+        fig.add_trace(go.Scattergl(x=group[x], y=group[y], mode='markers', name=str(label),
+                                   marker=dict(color=color_map.get(label), size=5)))
+    fig.update_layout(xaxis_title=x, yaxis_title=y)
+    if x_range is not None:
+        fig.update_layout(xaxis_range=list(x_range))
+    return fig
+
+def load_transaction_cube():
+    cube = load_summary('risk_cube_transactions')
+    if cube is None:
+        cube = build_transaction_cube(get_table('fraud', TRANSACTION_DIMS + ['fraud_risk_score', 'Class']))
+    return cube
+
+def load_credit_cube():
+    cube = load_summary('risk_cube_credit')
+    if cube is None:
+        cube = build_credit_cube(assign_risk_segment(get_table('credit', CREDIT_CUBE_COLUMNS).copy()))
+    return cube
+
+def load_dashboard_kpis():
+    kpis = load_summary('dashboard_kpis')
+    if kpis is None:
+        kpis = dashboard_kpis(get_table('credit', ['risk_band']), get_table('fraud', ['fraud_risk_score']),
+                              get_table('hybrid', ['hybrid_risk_score']))
+    return dict(zip(kpis['Metric'], kpis['Value']))
+
+def render_executive_core():
     st.title("Executive Intelligence Dashboard")
     st.markdown("Global Systemic Risk Analysis & Monitoring")
     
     col1, col2, col3, col4 = st.columns(4)
-    total_customers = len(credit_df)
-    high_risk_credit = len(credit_df[credit_df['risk_band'] == 'High Risk'])
-    fraud_attempts = len(fraud_df[fraud_df['fraud_risk_score'] > 70])
-    avg_hybrid_score = hybrid_df['hybrid_risk_score'].mean()
+    kpis = load_dashboard_kpis()
+    total_customers = int(kpis['Total Customers'])
+    high_risk_credit = int(kpis['High Risk Credit Profiles'])
+    fraud_attempts = int(kpis['Flagged Fraud Events'])
+    avg_hybrid_score = kpis['Avg Hybrid Risk Score']
     
     with col1:
         st.markdown('<div class="risk-low">', unsafe_allow_html=True)
@@ -80,72 +153,256 @@ def render_executive_core(credit_df, fraud_df, hybrid_df):
     c1, c2 = st.columns(2)
     with c1:
         st.subheader("Credit Risk Distribution")
-        fig_pie = px.pie(credit_df, names='risk_band', color='risk_band',
+        band_counts = slice_cube(load_credit_cube(), ['risk_band'])
+        fig_pie = px.pie(band_counts, names='risk_band', values='count', color='risk_band',
                          color_discrete_map={'High Risk':'#C62828', 'Medium Risk':'#ED6C02', 'Low Risk':'#2E7D32'},
                          hole=0.6)
         st.plotly_chart(update_chart_layout(fig_pie), use_container_width=True)
     with c2:
         st.subheader("Fraud Risk Trends (Last 24h)")
-        fraud_trend = fraud_df.groupby('transaction_hour')['fraud_risk_score'].mean().reset_index()
+        fraud_trend = slice_cube(load_transaction_cube(), ['transaction_hour'])
+        fraud_trend = fraud_trend.rename(columns={'score_mean': 'fraud_risk_score'})
         fig_line = px.area(fraud_trend, x='transaction_hour', y='fraud_risk_score', color_discrete_sequence=['#C62828'])
         st.plotly_chart(update_chart_layout(fig_line), use_container_width=True)
 
-def render_credit_center(credit_df):
+    render_capacity_planner()
+
+def render_capacity_planner():
+    st.subheader("Review Capacity Planner")
+    c1, c2, c3, c4 = st.columns(4)
+    portfolio = c1.selectbox("Portfolio", ['hybrid', 'credit', 'fraud'], format_func=str.title, key='capacity_portfolio')
+    scope = c2.selectbox("Split by", [s for p, s in LADDER_SCOPES if p == portfolio], format_func=str.title,
+                         key='capacity_scope')
+    capacity = c3.number_input("Reviews per period", min_value=0, value=DEFAULT_REVIEW_CAPACITY, step=10,
+                               key='capacity_reviews')
+    probe = c4.number_input("Volume at score ≥", min_value=0.0, max_value=100.0, value=float(HIGH_RISK_CUTOFF),
+                            key='capacity_probe')
+
+    ladder = get_score_ladder(portfolio, scope)
+    if ladder is None or len(ladder.scores) == 0:
+        st.info("No scores available for this portfolio.")
+        return
+
+    if scope == 'overall':
+        cutoff, volume = ladder.cutoff_for_capacity(capacity)
+        probe_volume = ladder.volume(probe)
+    else:
+        cutoff, volume = ladder.uniform_cutoff(capacity)
+        probe_volume = max(ladder.volume(probe, group) for group in ladder.groups)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Score Cutoff", f"{cutoff:.2f}")
+    col2.metric("Reviews at Cutoff" if scope == 'overall' else f"Peak Reviews per {scope.title()}", f"{volume:,}")
+    col3.metric(f"Reviews at Score ≥ {probe:g}" if scope == 'overall' else f"Peak Reviews at Score ≥ {probe:g}",
+                f"{probe_volume:,}", f"{probe_volume - capacity:+,} vs capacity", delta_color="inverse")
+
+    if scope != 'overall':
+        per_group = ladder.group_cutoffs(capacity)
+        per_group['volume_at_probe'] = [ladder.volume(probe, group) for group in ladder.groups]
+        st.dataframe(per_group.rename(columns={'group': scope}), use_container_width=True, hide_index=True)
+
+def render_credit_center():
     st.title("Credit Risk Assessment")
     st.markdown("Detailed exposure analysis and borrower delinquency profiling.")
     st.markdown('<div class="bg-light-yellow">', unsafe_allow_html=True)
     income_filter = st.slider("Filter by Monthly Income ($)", 0, 50000, (0, 50000))
     st.markdown('</div>', unsafe_allow_html=True)
     
-    filtered_credit = credit_df[(credit_df['MonthlyIncome'] >= income_filter[0]) & (credit_df['MonthlyIncome'] <= income_filter[1])]
+    income_rows = range_positions('credit', 'MonthlyIncome', *income_filter, columns=CREDIT_CENTER_COLUMNS)
+    filtered_credit = get_rows('credit', income_rows, CREDIT_CENTER_COLUMNS)
     col1, col2 = st.columns([2, 1])
     with col1:
         st.subheader("Debt-to-Income vs. Risk Quantization")
-        fig_scatter = px.scatter(filtered_credit.head(1000), x='debt_to_income_ratio', y='credit_risk_score',
-                                 color='risk_band', size='LoanAmount',
-                                 color_discrete_map={'High Risk':'#C62828', 'Medium Risk':'#ED6C02', 'Low Risk':'#2E7D32'})
-        fig_scatter.update_layout(xaxis_range=[0, 2])
+        fig_scatter = density_scatter(filtered_credit, 'debt_to_income_ratio', 'credit_risk_score', 'risk_band',
+                                      RISK_BAND_COLORS, size='LoanAmount', x_range=(0, 2))
         st.plotly_chart(update_chart_layout(fig_scatter), use_container_width=True)
     with col2:
         st.subheader("Delinquency Vectors")
-        delinquency_counts = filtered_credit.groupby('risk_band')['SeriousDlqin2yrs'].sum().reset_index()
+        delinquency_counts = filtered_credit.groupby('risk_band', as_index=False, observed=True)['SeriousDlqin2yrs'].sum()
         fig_bar = px.bar(delinquency_counts, x='risk_band', y='SeriousDlqin2yrs', color='risk_band',
                          color_discrete_map={'High Risk':'#C62828', 'Medium Risk':'#ED6C02', 'Low Risk':'#2E7D32'})
         fig_bar.update_layout(showlegend=False)
         st.plotly_chart(update_chart_layout(fig_bar), use_container_width=True)
 
-def render_fraud_scan(fraud_df):
+def render_fraud_scan():
     st.title("Fraud Surveillance System")
     st.markdown("Automated monitoring of transaction velocity and geospatial anomalies.")
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Anomaly Heatmap")
-        fig_heat = px.density_heatmap(fraud_df.sample(min(2000, len(fraud_df))), x='transaction_hour', y='Amount',
-                                      nbinsx=24, nbinsy=20, color_continuous_scale='Blues')
+        density = load_summary('fraud_hour_amount_density')
+        if density is None:
+            density = hour_amount_density(get_table('fraud', ['transaction_hour', 'Amount', 'Class']))
+        grid = density.pivot(index='amount_left', columns='hour', values='count')
+        amount_mid = (grid.index + density['amount_right'].max() / len(grid.index) / 2).round(2)
+        fig_heat = go.Figure(go.Heatmap(x=grid.columns, y=amount_mid, z=grid.values, colorscale='Blues'))
+        fig_heat.update_layout(xaxis_title='transaction_hour', yaxis_title='Amount')
         st.plotly_chart(update_chart_layout(fig_heat), use_container_width=True)
     with col2:
         st.subheader("High Risk Merchants")
-        merchant_risk = fraud_df[fraud_df['is_high_risk_merchant'] == 1]['MerchantCategory'].value_counts().reset_index()
+        merchant_risk = slice_cube(load_transaction_cube(), ['MerchantCategory'], is_high_risk_merchant=1)
+        merchant_risk = merchant_risk.sort_values('count', ascending=False)[['MerchantCategory', 'count']]
         merchant_risk.columns = ['Category', 'Count']
         fig_donut = px.pie(merchant_risk, values='Count', names='Category', hole=0.7)
         st.plotly_chart(update_chart_layout(fig_donut), use_container_width=True)
     
+    curve = load_summary('fraud_cutoff_curve')
+    if curve is not None:
+        st.subheader("Cutoff Trade-off")
+        fig_curve = px.line(curve, x='cutoff', y=['precision', 'recall'], color_discrete_sequence=['#1F4E79', '#C62828'])
+        fig_curve.add_vline(x=70, line_dash="dash", line_color="#C62828", opacity=0.3)
+        st.plotly_chart(update_chart_layout(fig_curve), use_container_width=True)
+
     st.subheader("Surveillance Registry")
-    suspicious = fraud_df[fraud_df['fraud_risk_score'] > 80][['Time', 'Amount', 'MerchantCategory', 'fraud_risk_score']]
-    st.dataframe(suspicious.style.background_gradient(cmap='YlOrRd', subset=['fraud_risk_score']), use_container_width=True)
+    c1, c2, c3 = st.columns([2, 1, 1])
+    sort_by = c1.selectbox("Sort by", ['fraud_risk_score', 'Amount', 'Time'])
+    descending = c2.toggle("Descending", value=True)
+    page_size = c3.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+
+    order = sorted_index('fraud', sort_by, where=('fraud_risk_score', 80), descending=descending,
+                         columns=REGISTRY_COLUMNS)
+    n_pages = max(1, -(-len(order) // page_size))
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
+    suspicious = get_rows('fraud', order[(page - 1) * page_size:page * page_size], REGISTRY_COLUMNS)
+    st.caption(f"{len(order):,} flagged transactions · page {page} of {n_pages}")
+    st.dataframe(suspicious, use_container_width=True, hide_index=True, column_config={
+        'fraud_risk_score': st.column_config.ProgressColumn("fraud_risk_score", min_value=0, max_value=100, format="%d")
+    })
+    render_export_panel()
+
+def read_export(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def render_export_panel():
+    with st.expander("Export Flagged Transactions"):
+        c1, c2, c3, c4 = st.columns(4)
+        categories = c1.multiselect("Merchant categories", sorted(load_transaction_cube()['MerchantCategory'].unique()))
+        min_score = c2.slider("Minimum fraud score", 0, 100, 70)
+        last_days = c3.number_input("Last N days (0 = all)", min_value=0, value=0, step=1)
+        fmt = c4.radio("Format", ['csv', 'parquet'], horizontal=True)
 
-def render_hybrid_lab(hybrid_df):
+        if st.button("Prepare export"):
+            where, params = [query.at_least('fraud_risk_score')], [min_score]
+            if categories:
+                where.append(query.one_of('MerchantCategory', categories))
+                params += categories
+            if last_days:
+                latest = query.query(f"SELECT MAX(relative_day) AS day FROM {query.source('fraud')}")['day'].iloc[0]
+                where.append(query.at_least('relative_day'))
+                params.append(int(latest) - last_days + 1)
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            query.prune_exports(EXPORT_DIR, EXPORT_RETENTION_SECONDS)
+            path = os.path.join(EXPORT_DIR, f"fraud_export_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.{fmt}")
+            size = query.export_rows('fraud', EXPORT_COLUMNS, path, ' AND '.join(where), params, fmt)
+            st.session_state['fraud_export'] = (path, size)
+
+        export = st.session_state.get('fraud_export')
+        if export and os.path.exists(export[0]):
+            path, size = export
+            if size <= EXPORT_DOWNLOAD_LIMIT:
+                st.download_button(f"Download {os.path.basename(path)} ({size / 1e6:.1f} MB)",
+                                   data=functools.partial(read_export, path), file_name=os.path.basename(path))
+            else:
+                st.info(f"Export is {size / 1e6:.0f} MB, above the download limit. Saved to {path}.")
+
+def render_hybrid_lab():
     st.title("Strategic Risk Synthesis")
+    hybrid_df = get_table('hybrid', HYBRID_LAB_COLUMNS)
     st.markdown("Consolidated multi-vector intelligence merging Credit and Transaction data.")
     st.markdown("### Integrated Risk Matrix")
-    fig_matrix = px.scatter(hybrid_df, x='credit_risk_score', y='fraud_risk_score', color='hybrid_risk_status',
-                            color_discrete_map={'Hypersensitive':'#C62828', 'Moderate':'#ED6C02', 'Standard':'#2E7D32'},
-                            size='hybrid_risk_score')
+    fig_matrix = density_scatter(hybrid_df, 'credit_risk_score', 'fraud_risk_score', 'hybrid_risk_status',
+                                 HYBRID_STATUS_COLORS, size='hybrid_risk_score')
     fig_matrix.add_vline(x=70, line_dash="dash", line_color="#C62828", opacity=0.3)
     fig_matrix.add_hline(y=70, line_dash="dash", line_color="#C62828", opacity=0.3)
     st.plotly_chart(update_chart_layout(fig_matrix), use_container_width=True)
 
-def render_portal_home(credit_df, fraud_df, hybrid_df):
+    store = get_feature_store()
+    if store is not None:
+        st.markdown("### Customer Lookup")
+        customer_id = st.number_input("Customer ID", min_value=0, value=int(hybrid_df['CustomerID'].iloc[0]), step=1)
+        features = store.get(customer_id)
+        if features is None:
+            st.info(f"No features stored for customer {customer_id}.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Credit Risk Score", f"{features['credit_risk_score'] or 0:.0f}", features['credit_risk_band'], delta_color="off")
+            col2.metric("Max Fraud Score", f"{features['fraud_risk_score'] or 0:.0f}", features['fraud_risk_band'], delta_color="off")
+            col3.metric("Hybrid Risk Score", f"{features['hybrid_risk_score'] or 0:.1f}", features['hybrid_risk_status'], delta_color="off")
+            st.caption(f"Last seen in {features['last_city']} with {features['txn_count_1h'] or 0:.0f} transactions "
+                       f"in the trailing hour.")
+
+        timeline = get_timeline()
+        if timeline is not None:
+            history = timeline.frame(customer_id, ['Time', 'Amount', 'MerchantCategory', 'City',
+                                                   'fraud_risk_score', 'risk_reason_summary'])
+            st.dataframe(history, use_container_width=True, hide_index=True)
+
+def render_what_if():
+    st.title("Rule What-If Simulator")
+    st.markdown("Re-weight the scoring rules and move the band cutoffs to preview band volumes against production.")
+    portfolio = st.radio("Portfolio", ['credit', 'fraud'], horizontal=True, format_func=str.title)
+    published = get_rule_patterns(portfolio)
+    if published is None:
+        st.info("Run the scoring engine to publish rule hits for this portfolio.")
+        return
+
+    production_medium, production_high = published['cutoffs']
+    weights = []
+    cols = st.columns(4)
+    for i, (reason, weight) in enumerate(zip(published['reasons'], published['weights'])):
+        weights.append(cols[i % 4].slider(str(reason), 0, 50, int(weight), key=f"whatif_{portfolio}_{i}"))
+    c1, c2 = st.columns(2)
+    medium, high = c1.slider("Medium / High cutoffs", 0, 100, (int(production_medium), int(production_high)),
+                             key=f"whatif_{portfolio}_cutoffs")
+
+    patterns, counts = published['patterns'], published['counts']
+    production = band_counts(patterns, counts, published['weights'], production_high, production_medium)
+    scenario = band_counts(patterns, counts, weights, high, medium)
+    c2.caption(f"{counts.sum():,} rows collapse to {len(patterns)} distinct rule-hit patterns.")
+
+    cols = st.columns(3)
+    for col, label, now, base in zip(cols, BAND_LABELS[::-1], scenario[::-1], production[::-1]):
+        col.metric(label, f"{now:,}", f"{now - base:+,}", delta_color="inverse" if label == 'High Risk' else "off")
+
+    comparison = pd.DataFrame({'risk_band': BAND_LABELS * 2, 'count': np.concatenate([production, scenario]),
+                               'run': ['Production'] * 3 + ['What-If'] * 3})
+    fig_bands = px.bar(comparison, x='risk_band', y='count', color='run', barmode='group',
+                       color_discrete_sequence=['#5F6368', '#1F4E79'])
+    st.plotly_chart(update_chart_layout(fig_bands), use_container_width=True)
+
+def tail_event_log():
+    if 'live_monitor' not in st.session_state:
+        st.session_state['live_monitor'] = load_checkpoint()
+    state = st.session_state['live_monitor']
+    for seq, events in read_segments(state['offset']):
+        fold_segment(state, seq, events, LIVE_HISTORY_SEGMENTS)
+    return state
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_feed():
+    state = tail_event_log()
+    if state['offset'] < 0:
+        st.info("No scored segments yet. Run the scoring engine to start the feed.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Events Ingested", f"{state['transactions']:,}")
+    col2.metric("High Risk Flags", f"{state['flagged']:,}")
+    col3.metric("Flag Rate", f"{state['flagged'] / max(state['transactions'], 1) * 100:.2f}%")
+    col4.metric("Avg Fraud Score", f"{state['score_sum'] / max(state['transactions'], 1):.1f}")
+
+    segments = pd.DataFrame(state['segments'])
+    fig_live = px.bar(segments, x='segment', y='flagged', hover_data=['transactions', 'flag_rate_pct'],
+                      color_discrete_sequence=['#C62828'])
+    st.plotly_chart(update_chart_layout(fig_live), use_container_width=True)
+    st.caption(f"Tailing segment {state['offset']:,} · refreshes every {LIVE_REFRESH_SECONDS}s")
+
+def render_live_monitor():
+    st.title("Live Monitor")
+    st.markdown("Streaming view of scored transactions as the engine appends them to the event log.")
+    render_live_feed()
+
+def render_portal_home():
     st.markdown(f"""
         <div style="background: linear-gradient(135deg, #FFF3CC 0%, #FFFFFF 100%); border: 1px solid #E2D7B8; padding: 40px; border-radius: 12px; margin-bottom: 30px; box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.05);">
             <h1 style="margin:0; color: #1F4E79;">Institutional Command Center</h1>
@@ -156,18 +413,19 @@ def render_portal_home(credit_df, fraud_df, hybrid_df):
     """, unsafe_allow_html=True)
     
     st.markdown("### Key Risk Indicators")
+    kpis = load_dashboard_kpis()
     col1, col2, col3 = st.columns(3)
     with col1:
         st.markdown('<div class="risk-low">', unsafe_allow_html=True)
-        st.metric("Portfolio Coverage", f"{len(credit_df):,}", "Active Nodes")
+        st.metric("Portfolio Coverage", f"{int(kpis['Total Customers']):,}", "Active Nodes")
         st.markdown('</div>', unsafe_allow_html=True)
     with col2:
-        fraud_val = len(fraud_df[fraud_df['fraud_risk_score'] > 75])
+        fraud_val = int(kpis['Critical Anomalies'])
         st.markdown('<div class="risk-high">', unsafe_allow_html=True)
         st.metric("Critical Anomalies", f"{fraud_val:,}", "High Severity")
         st.markdown('</div>', unsafe_allow_html=True)
     with col3:
-        hybrid_avg = hybrid_df['hybrid_risk_score'].mean()
+        hybrid_avg = kpis['Avg Hybrid Risk Score']
         risk_class = "risk-low" if hybrid_avg < 40 else "risk-medium" if hybrid_avg < 70 else "risk-high"
         st.markdown(f'<div class="{risk_class}">', unsafe_allow_html=True)
         st.metric("Global Risk Posture", f"{hybrid_avg:.2f}", "Stability Index")
@@ -175,10 +433,9 @@ def render_portal_home(credit_df, fraud_df, hybrid_df):
 
 
 def main():
-    credit_df, fraud_df, hybrid_df = load_data()
     render_top_header()
     
-    if credit_df is None or fraud_df is None or hybrid_df is None:
+    if not tables_available():
         st.warning("Please run the data pipeline to generate risk scores before accessing the dashboard.")
         st.info("Locally: Run 'python run_pipeline.py'. In cloud: Ensure data files are pushed to the repository.")
         st.stop()
@@ -187,15 +444,19 @@ def main():
     
     with st.container():
         if page_selection == "Portal Home":
-            render_portal_home(credit_df, fraud_df, hybrid_df)
+            render_portal_home()
         elif page_selection == "Executive Core":
-            render_executive_core(credit_df, fraud_df, hybrid_df)
+            render_executive_core()
         elif page_selection == "Credit Center":
-            render_credit_center(credit_df)
+            render_credit_center()
         elif page_selection == "Fraud Scan":
-            render_fraud_scan(fraud_df)
+            render_fraud_scan()
         elif page_selection == "Hybrid Lab":
-            render_hybrid_lab(hybrid_df)
+            render_hybrid_lab()
+        elif page_selection == "What-If":
+            render_what_if()
+        elif page_selection == "Live Monitor":
+            render_live_monitor()
 
 if __name__ == "__main__":
     main()
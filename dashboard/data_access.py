@@ -0,0 +1,123 @@
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hris.core.feature_store import FEATURE_STORE_PATH, FeatureStore
+from hris.core.rule_hits import rule_hits_path
+from hris.core.timeline import TIMELINE_DIR, CustomerTimeline, timeline_pointer
+from hris.reporting.capacity import build_ladder, ladder_columns
+from hris.reporting.whatif import load_rule_patterns
+
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+TABLES = {
+    'credit': 'credit_risk_scores.csv',
+    'fraud': 'fraud_risk_scores.csv',
+    'hybrid': 'hybrid_customer_profiles.csv'
+}
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _read_csv(path, signature, columns=None):
+    return pd.read_csv(path, usecols=list(columns) if columns else None)
+
+def _read_data_file(name, columns=None):
+    path = os.path.join(DATA_DIR, name)
+    signature = file_signature(path)
+    if signature is None:
+        return None
+    return _read_csv(path, signature, tuple(sorted(columns)) if columns else None)
+
+def tables_available(*names):
+    return all(file_signature(os.path.join(DATA_DIR, TABLES[name])) is not None for name in names or TABLES)
+
+def get_table(name, columns=None):
+    return _read_data_file(TABLES[name], columns)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _sorted_index(name, signature, by, where, descending, columns):
+    table = get_table(name, columns or [by] + ([where[0]] if where else []))
+    values = table[by].to_numpy()
+    rows = np.flatnonzero(table[where[0]].to_numpy() > where[1]) if where else np.arange(len(table))
+    keys = values[rows]
+    order = np.argsort(-keys if descending else keys, kind='stable')
+    return rows[order]
+
+def sorted_index(name, by, where=None, descending=False, columns=None):
+    signature = file_signature(os.path.join(DATA_DIR, TABLES[name]))
+    if signature is None:
+        return None
+    return _sorted_index(name, signature, by, where, descending, tuple(columns) if columns else None)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _range_index(name, signature, column, columns):
+    values = get_table(name, columns or [column])[column].to_numpy()
+    order = np.argsort(values, kind='stable')
+    return order, values[order]
+
+def range_positions(name, column, low, high, columns=None):
+    signature = file_signature(os.path.join(DATA_DIR, TABLES[name]))
+    if signature is None:
+        return None
+    order, keys = _range_index(name, signature, column, tuple(columns) if columns else None)
+    return order[np.searchsorted(keys, low, side='left'):np.searchsorted(keys, high, side='right')]
+
+def get_rows(name, positions, columns):
+    return get_table(name, columns).iloc[positions]
+
+def load_summary(name):
+    return _read_data_file(f"{name}.csv")
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _rule_patterns(path, signature):
+    return load_rule_patterns(path)
+
+def get_rule_patterns(portfolio):
+    path = rule_hits_path(portfolio)
+    signature = file_signature(path)
+    if signature is None:
+        return None
+    return _rule_patterns(path, signature)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _score_ladder(portfolio, scope, signature):
+    return build_ladder(get_table(portfolio, ladder_columns(portfolio, scope)), portfolio, scope)
+
+def get_score_ladder(portfolio, scope='overall'):
+    signature = file_signature(os.path.join(DATA_DIR, TABLES[portfolio]))
+    if signature is None:
+        return None
+    return _score_ladder(portfolio, scope, signature)
+
+@st.cache_resource(max_entries=2)
+def _open_feature_store(signature):
+    return FeatureStore(FEATURE_STORE_PATH, read_only=True)
+
+def get_feature_store():
+    signature = file_signature(FEATURE_STORE_PATH)
+    if signature is None:
+        return None
+    return _open_feature_store(signature)
+
+@st.cache_resource(max_entries=2)
+def _open_timeline(signature):
+    return CustomerTimeline(TIMELINE_DIR)
+
+def get_timeline():
+    signature = file_signature(timeline_pointer())
+    if signature is None:
+        return None
+    return _open_timeline(signature)
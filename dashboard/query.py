@@ -0,0 +1,89 @@
+
+import streamlit as st
+import duckdb
+import os
+import time
+from data_access import DATA_DIR, TABLES, file_signature
+
+
+@st.cache_resource
+def _connection():
+    return duckdb.connect(database=':memory:')
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def _literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+def source(table):
+    csv_path = os.path.join(DATA_DIR, TABLES[table])
+    parquet = os.path.splitext(csv_path)[0] + '.parquet'
+    parquet_sig, csv_sig = file_signature(parquet), file_signature(csv_path)
+    if parquet_sig is not None and (csv_sig is None or parquet_sig[0] >= csv_sig[0]):
+        return f"read_parquet({_literal(parquet)})"
+    return f"read_csv_auto({_literal(csv_path)})"
+
+def query(sql, params=()):
+    cursor = _connection().cursor()
+    try:
+        return cursor.execute(sql, list(params)).df()
+    finally:
+        cursor.close()
+
+def _select_sql(table, columns, where=None, order_by=None, descending=False, limit=None):
+    sql = f"SELECT {', '.join(_quote(c) for c in columns)} FROM {source(table)}"
+    if where:
+        sql += f" WHERE {where}"
+    if order_by:
+        sql += f" ORDER BY {_quote(order_by)}{' DESC' if descending else ''}"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql
+
+def iter_csv_chunks(table, columns, where=None, params=(), chunk_vectors=64):
+    cursor = _connection().cursor()
+    try:
+        cursor.execute(_select_sql(table, columns, where), list(params))
+        header = True
+        while True:
+            chunk = cursor.fetch_df_chunk(chunk_vectors)
+            if chunk.empty:
+                break
+            yield chunk.to_csv(index=False, header=header).encode()
+            header = False
+    finally:
+        cursor.close()
+
+def export_rows(table, columns, path, where=None, params=(), fmt='csv'):
+    staging = f"{path}.tmp"
+    if fmt == 'parquet':
+        cursor = _connection().cursor()
+        try:
+            cursor.execute(f"COPY ({_select_sql(table, columns, where)}) TO {_literal(staging)} (FORMAT PARQUET)",
+                           list(params))
+        finally:
+            cursor.close()
+    else:
+        with open(staging, 'wb') as f:
+            for chunk in iter_csv_chunks(table, columns, where, params):
+                f.write(chunk)
+    os.replace(staging, path)
+    return os.path.getsize(path)
+
+def prune_exports(directory, max_age_seconds):
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+def at_least(column):
+    return f"{_quote(column)} >= ?"
+
+def one_of(column, values):
+    return f"{_quote(column)} IN ({', '.join('?' * len(values))})"
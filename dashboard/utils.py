@@ -2,6 +2,10 @@
 import streamlit as st
 import pandas as pd
 import os
+import sys
+
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 def apply_custom_css():
 
@@ -159,17 +163,6 @@ def apply_custom_css():
     except ImportError:
         pass
 
-@st.cache_data
-def load_data():
-    base_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-    try:
-        credit = pd.read_csv(os.path.join(base_dir, 'credit_risk_scores.csv'))
-        fraud = pd.read_csv(os.path.join(base_dir, 'fraud_risk_scores.csv'))
-        hybrid = pd.read_csv(os.path.join(base_dir, 'hybrid_customer_profiles.csv'))
-        return credit, fraud, hybrid
-    except Exception:
-        return None, None, None
-
 def render_top_header():
 
     if 'current_page' not in st.session_state:
@@ -187,13 +180,15 @@ def render_top_header():
         </div>
     """, unsafe_allow_html=True)
 
-    cols = st.columns([1, 1, 1, 1, 1])
+    cols = st.columns([1, 1, 1, 1, 1, 1, 1])
     pages = [
         ("Portal Home", "Portal Home"),
         ("Executive Core", "Executive Core"),
         ("Credit Center", "Credit Center"),
         ("Fraud Scan", "Fraud Scan"),
-        ("Hybrid Lab", "Hybrid Lab")
+        ("Hybrid Lab", "Hybrid Lab"),
+        ("What-If", "What-If"),
+        ("Live Monitor", "Live Monitor")
     ]
 
     for i, (label, value) in enumerate(pages):
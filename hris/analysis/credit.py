@@ -1,70 +1,125 @@
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import os
+from hris.analysis.moments import MomentAccumulator, update_segment_moments, merge_segment_moments, save_moments, load_moments
+from hris.core.segments import assign_risk_segment
+from hris.analysis.summaries import histogram_from_counts, save_summary
+from hris.utils.rendering import submit_plot, render_histogram, render_heatmap, wait_for_renders
 
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 PLOTS_DIR = os.path.join(BASE_DIR, 'plots')
+MOMENTS_PATH = os.path.join(DATA_DIR, 'credit_moments.npz')
 
-def perform_credit_eda(df):
+EDA_COLUMNS = ['SeriousDlqin2yrs', 'age', 'debt_to_income_ratio', 'MonthlyIncome', 
+               'NumberOfOpenCreditLinesAndLoans', 'NumberRealEstateLoansOrLines', 'LoanAmount']
+SEGMENT_COLUMNS = ['MonthlyIncome', 'debt_to_income_ratio', 'age', 'LoanAmount']
+HIST_BINS = 50
+DTI_ZOOM = 2.0
+
+def _edges(hist):
+
+    return np.append(hist['bin_left'].to_numpy(), hist['bin_right'].iloc[-1])
+
+def accumulate_credit_moments(chunks, overall=None, segments=None):
+
+    overall = overall or MomentAccumulator(EDA_COLUMNS)
+    segments = segments if segments is not None else {}
+    for chunk in chunks:
+        overall.update(chunk)
+        update_segment_moments(segments, assign_risk_segment(chunk), 'risk_segment', SEGMENT_COLUMNS)
+    return overall, segments
+
+def _histogram_edges(overall):
+
+    lo, hi = overall.min, overall.max
+    income = EDA_COLUMNS.index('MonthlyIncome')
+    dti = EDA_COLUMNS.index('debt_to_income_ratio')
+    dti_lo = min(lo[dti], DTI_ZOOM)
+    return (np.linspace(lo[income], max(hi[income], lo[income] + 1e-9), HIST_BINS + 1),
+            np.linspace(dti_lo, max(DTI_ZOOM, dti_lo + 1e-9), HIST_BINS + 1))
+
+def accumulate_credit_histograms(chunks, overall):
+
+    income_edges, dti_edges = _histogram_edges(overall)
+    income_counts = np.zeros(HIST_BINS, dtype=np.int64)
+    dti_counts = np.zeros(HIST_BINS, dtype=np.int64)
+    for chunk in chunks:
+        income_counts += np.histogram(chunk['MonthlyIncome'].dropna(), bins=income_edges)[0]
+        dti = chunk['debt_to_income_ratio']
+        dti_counts += np.histogram(dti[dti < DTI_ZOOM].dropna(), bins=dti_edges)[0]
+    return histogram_from_counts(income_counts, income_edges), histogram_from_counts(dti_counts, dti_edges)
+
+def publish_credit_eda(income_hist, dti_hist, overall):
 
-    print("Performing Credit Risk EDA...")
     if not os.path.exists(PLOTS_DIR):
         os.makedirs(PLOTS_DIR)
 
-    plt.figure(figsize=(10, 6))
-    sns.histplot(df['MonthlyIncome'], bins=50, kde=True)
-    plt.title('Distribution of Monthly Income')
-    plt.savefig(os.path.join(PLOTS_DIR, 'credit_income_distribution.png'))
-    plt.close()
-    
-    plt.figure(figsize=(10, 6))
-    sns.histplot(df[df['debt_to_income_ratio'] < 2]['debt_to_income_ratio'], bins=50, kde=True)
-    plt.title('Debt-to-Income Ratio Distribution (Zoomed < 2.0)')
-    plt.savefig(os.path.join(PLOTS_DIR, 'credit_dti_distribution.png'))
-    plt.close()
-    
-    plt.figure(figsize=(12, 10))
-    cols = ['SeriousDlqin2yrs', 'age', 'debt_to_income_ratio', 'MonthlyIncome', 
-            'NumberOfOpenCreditLinesAndLoans', 'NumberRealEstateLoansOrLines', 'LoanAmount']
-    corr = df[cols].corr()
-    sns.heatmap(corr, annot=True, cmap='coolwarm', fmt=".2f")
-    plt.title('Credit Risk Correlation Heatmap')
-    plt.savefig(os.path.join(PLOTS_DIR, 'credit_correlation_heatmap.png'))
-    plt.close()
-
-def generate_risk_segmentation(df):
+    save_summary(income_hist, 'credit_income_histogram')
+    submit_plot(render_histogram, os.path.join(PLOTS_DIR, 'credit_income_distribution.png'),
+                counts=income_hist['count'].to_numpy(), edges=_edges(income_hist),
+                kde=income_hist['kde_count'].to_numpy(), title='Distribution of Monthly Income')
 
-    print("Generating Risk Segmentation...")
-    conditions = [
-        (df['SeriousDlqin2yrs'] == 1),
-        (df['debt_to_income_ratio'] > 0.6) | (df['NumberOfTimes90DaysLate'] > 0),
-        (df['MonthlyIncome'] > 5000) & (df['debt_to_income_ratio'] < 0.3)
-    ]
-    choices = ['High Risk (Delinquent)', 'Medium Risk (High DTI/Late)', 'Low Risk (Prime)']
-    df['risk_segment'] = np.select(conditions, choices, default='Medium Risk')
-    
-    summary = df.groupby('risk_segment').agg({
-        'MonthlyIncome': 'mean',
-        'debt_to_income_ratio': 'mean',
-        'age': 'mean',
-        'LoanAmount': 'mean',
-        'SeriousDlqin2yrs': 'count'
-    }).rename(columns={'SeriousDlqin2yrs': 'Count'}).reset_index()
-    
+    save_summary(dti_hist, 'credit_dti_histogram')
+    submit_plot(render_histogram, os.path.join(PLOTS_DIR, 'credit_dti_distribution.png'),
+                counts=dti_hist['count'].to_numpy(), edges=_edges(dti_hist),
+                kde=dti_hist['kde_count'].to_numpy(), title='Debt-to-Income Ratio Distribution (Zoomed < 2.0)')
+
+    corr = overall.correlation()
+    submit_plot(render_heatmap, os.path.join(PLOTS_DIR, 'credit_correlation_heatmap.png'),
+                matrix=corr.values, labels=EDA_COLUMNS, title='Credit Risk Correlation Heatmap')
+
+def publish_risk_segmentation(segments):
+
+    rows = []
+    for segment in sorted(segments):
+        acc = segments[segment]
+        rows.append(dict(risk_segment=segment, **acc.means().to_dict(), Count=acc.n))
+    summary = pd.DataFrame(rows, columns=['risk_segment'] + SEGMENT_COLUMNS + ['Count'])
     summary.to_csv(os.path.join(DATA_DIR, 'credit_risk_segments_summary.csv'), index=False)
     return summary
 
-def run_credit_analysis():
+def update_risk_segmentation(new_df, moments_path=MOMENTS_PATH):
+
+    print(f"Updating Risk Segmentation with {len(new_df)} new applicants...")
+    state = load_moments(moments_path)
+    overall = state.pop('__overall__', MomentAccumulator(EDA_COLUMNS))
+    batch_overall, batch_segments = accumulate_credit_moments([new_df])
+    overall.merge(batch_overall)
+    segments = merge_segment_moments(state, batch_segments)
+    save_moments(moments_path, {'__overall__': overall, **segments})
+    return publish_risk_segmentation(segments)
+
+def run_credit_analysis(chunksize=None):
     CREDIT_CLEAN_PATH = os.path.join(DATA_DIR, 'cleaned_credit_data.csv')
-    df = pd.read_csv(CREDIT_CLEAN_PATH)
-    perform_credit_eda(df)
-    generate_risk_segmentation(df)
+    if chunksize is None:
+        df = pd.read_csv(CREDIT_CLEAN_PATH)
+        chunks = lambda: [df]
+    else:
+        chunks = lambda: pd.read_csv(CREDIT_CLEAN_PATH, chunksize=chunksize)
+
+    print("Performing Credit Risk EDA...")
+    overall, segments = accumulate_credit_moments(chunks())
+    income_hist, dti_hist = accumulate_credit_histograms(chunks(), overall)
+    publish_credit_eda(income_hist, dti_hist, overall)
+
+    print("Generating Risk Segmentation...")
+    publish_risk_segmentation(segments)
+    save_moments(MOMENTS_PATH, {'__overall__': overall, **segments})
     print("Credit analysis complete.")
 
 if __name__ == "__main__":
-    run_credit_analysis()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Credit EDA and risk segmentation from streamed moment accumulators.")
+    parser.add_argument('--chunksize', type=int, help="Read the cleaned credit data in chunks of this many rows")
+    parser.add_argument('--append', metavar='CSV',
+                        help="Fold newly cleaned applicants into the saved segment moments instead of a full run")
+    args = parser.parse_args()
+    if args.append:
+        update_risk_segmentation(pd.read_csv(args.append))
+    else:
+        run_credit_analysis(args.chunksize)
+        wait_for_renders()
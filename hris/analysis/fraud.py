@@ -1,10 +1,10 @@
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import os
 from hris.utils.profiling import profile_runtime
+from hris.analysis.summaries import hour_amount_density, category_counts, save_summary
+from hris.utils.rendering import submit_plot, render_density_grid, render_category_counts, wait_for_renders
 
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -21,21 +21,21 @@ def analyze_transaction_anomalies(df):
     threshold_95 = df['Amount'].quantile(0.95)
     df['is_high_value'] = df['Amount'] > threshold_95
     
-    plot_df = df.sample(min(10000, len(df)))
-    plt.figure(figsize=(10, 6))
-    plt.scatter(plot_df['transaction_hour'], plot_df['Amount'], 
-                c=plot_df['Class'], cmap='coolwarm', alpha=0.5)
-    plt.title('Transaction Amount vs Hour (Colored by Fraud Class)')
-    plt.savefig(os.path.join(PLOTS_DIR, 'fraud_heatmap_amount_hour.png'))
-    plt.close()
+    density = hour_amount_density(df)
+    save_summary(density, 'fraud_hour_amount_density')
+    amount_edges = np.append(np.unique(density['amount_left']), density['amount_right'].max())
+    submit_plot(render_density_grid, os.path.join(PLOTS_DIR, 'fraud_heatmap_amount_hour.png'),
+                counts=density['count'].to_numpy().reshape(24, -1), x_edges=np.arange(25),
+                y_edges=amount_edges, title='Transaction Density by Amount and Hour',
+                xlabel='transaction_hour', ylabel='Amount')
     
     df['is_night_transaction'] = df['transaction_hour'].between(2, 4)
     
-    plt.figure(figsize=(10, 6))
-    sns.countplot(y='MerchantCategory', data=df, hue='is_high_risk_merchant', palette='viridis')
-    plt.title('Distribution of Transactions by Merchant Category')
-    plt.savefig(os.path.join(PLOTS_DIR, 'fraud_merchant_distribution.png'))
-    plt.close()
+    merchant_counts = category_counts(df, 'MerchantCategory', 'is_high_risk_merchant')
+    save_summary(merchant_counts, 'fraud_merchant_counts')
+    submit_plot(render_category_counts, os.path.join(PLOTS_DIR, 'fraud_merchant_distribution.png'),
+                counts=merchant_counts, category='MerchantCategory', hue='is_high_risk_merchant',
+                title='Distribution of Transactions by Merchant Category')
 
 @profile_runtime
 def generate_anomaly_summary(df):
@@ -54,3 +54,4 @@ def run_fraud_analysis():
 
 if __name__ == "__main__":
     run_fraud_analysis()
+    wait_for_renders()
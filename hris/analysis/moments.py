@@ -0,0 +1,128 @@
+
+import pandas as pd
+import numpy as np
+import os
+
+
+class MomentAccumulator:
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = 0
+        self.counts = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.co = np.zeros((k, k))
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    def update(self, df):
+        values = df[self.columns].to_numpy(dtype=float)
+        if len(values) == 0:
+            return self
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+        chunk = MomentAccumulator(self.columns)
+        chunk.n = len(values)
+        chunk.counts = mask.T @ mask
+        shift = np.where(present, values, 0.0).sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+        centered = np.where(present, values - shift, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pair_mean = np.where(chunk.counts > 0, (centered.T @ mask) / chunk.counts, 0.0)
+        chunk.mean = pair_mean + shift[:, None]
+        chunk.m2 = (centered ** 2).T @ mask - chunk.counts * pair_mean ** 2
+        chunk.co = centered.T @ centered - chunk.counts * pair_mean * pair_mean.T
+        chunk.min = np.where(present, values, np.inf).min(axis=0)
+        chunk.max = np.where(present, values, -np.inf).max(axis=0)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns.")
+        if other.n == 0:
+            return self
+        counts = self.counts + other.counts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(counts > 0, self.counts * other.counts / counts, 0.0)
+            share = np.where(counts > 0, other.counts / counts, 0.0)
+        delta = other.mean - self.mean
+        self.m2 = self.m2 + other.m2 + delta ** 2 * weight
+        self.co = self.co + other.co + delta * delta.T * weight
+        self.mean = self.mean + delta * share
+        self.counts = counts
+        self.n += other.n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    def means(self):
+        mean = np.where(np.diag(self.counts) > 0, np.diag(self.mean), np.nan)
+        return pd.Series(mean, index=self.columns)
+
+    def covariance(self, ddof=1):
+        denom = self.counts - ddof
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = np.where(denom > 0, self.co / denom, np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.co / np.sqrt(self.m2 * self.m2.T)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def to_arrays(self, prefix):
+        return {
+            f"{prefix}::n": np.array(self.n),
+            f"{prefix}::counts": self.counts,
+            f"{prefix}::mean": self.mean,
+            f"{prefix}::m2": self.m2,
+            f"{prefix}::co": self.co,
+            f"{prefix}::min": self.min,
+            f"{prefix}::max": self.max,
+            f"{prefix}::columns": np.array(self.columns)
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix):
+        acc = cls(arrays[f"{prefix}::columns"].tolist())
+        acc.n = int(arrays[f"{prefix}::n"])
+        acc.counts = arrays[f"{prefix}::counts"]
+        acc.mean = arrays[f"{prefix}::mean"]
+        acc.m2 = arrays[f"{prefix}::m2"]
+        acc.co = arrays[f"{prefix}::co"]
+        acc.min = arrays[f"{prefix}::min"]
+        acc.max = arrays[f"{prefix}::max"]
+        return acc
+
+def update_segment_moments(segments, df, segment_col, columns):
+
+    for segment, group in df.groupby(segment_col):
+        if segment not in segments:
+            segments[segment] = MomentAccumulator(columns)
+        segments[segment].update(group)
+    return segments
+
+def merge_segment_moments(left, right):
+
+    for segment, acc in right.items():
+        if segment in left:
+            left[segment].merge(acc)
+        else:
+            left[segment] = acc
+    return left
+
+def save_moments(path, accumulators):
+
+    arrays = {'names': np.array(list(accumulators))}
+    for name, acc in accumulators.items():
+        arrays.update(acc.to_arrays(name))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(path, **arrays)
+
+def load_moments(path):
+
+    if not os.path.exists(path):
+        return {}
+    with np.load(path) as arrays:
+        return {name: MomentAccumulator.from_arrays(arrays, name) for name in arrays['names'].tolist()}
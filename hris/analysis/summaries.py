@@ -0,0 +1,94 @@
+
+import pandas as pd
+import numpy as np
+import os
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+def binned_kde(counts, edges):
+
+    n = counts.sum()
+    if n < 2:
+        return np.zeros(len(counts))
+    width = edges[1] - edges[0]
+    centers = (edges[:-1] + edges[1:]) / 2
+    mean = (counts * centers).sum() / n
+    std = np.sqrt((counts * (centers - mean) ** 2).sum() / (n - 1))
+    bandwidth = max(std * n ** (-1 / 5), width / 2)
+
+    offsets = np.arange(-len(counts) + 1, len(counts)) * width
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    return np.convolve(counts, kernel)[len(counts) - 1:2 * len(counts) - 1]
+
+def histogram_from_counts(counts, edges):
+
+    return pd.DataFrame({
+        'bin_left': edges[:-1],
+        'bin_right': edges[1:],
+        'count': counts,
+        'kde_count': binned_kde(counts, edges)
+    })
+
+def density_grid(x, y, x_edges, y_edges, weights=None):
+
+    x = np.clip(np.asarray(x, dtype=float), x_edges[0], np.nextafter(x_edges[-1], -np.inf))
+    y = np.clip(np.asarray(y, dtype=float), y_edges[0], np.nextafter(y_edges[-1], -np.inf))
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    grid = pd.DataFrame({
+        'x_left': np.repeat(x_edges[:-1], len(y_edges) - 1),
+        'x_right': np.repeat(x_edges[1:], len(y_edges) - 1),
+        'y_left': np.tile(y_edges[:-1], len(x_edges) - 1),
+        'y_right': np.tile(y_edges[1:], len(x_edges) - 1),
+        'count': counts.ravel().astype(int)
+    })
+    if weights is not None:
+        weighted, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=weights)
+        grid['weight'] = weighted.ravel()
+    return grid
+
+def scatter_density(x, y, bins=60, x_range=None, y_range=None, outlier_count=1, max_outliers=2000):
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x_range = x_range or (np.min(x[finite], initial=0), np.max(x[finite], initial=1))
+    y_range = y_range or (np.min(y[finite], initial=0), np.max(y[finite], initial=1))
+    x_edges = np.linspace(x_range[0], max(x_range[1], x_range[0] + 1e-9), bins + 1)
+    y_edges = np.linspace(y_range[0], max(y_range[1], y_range[0] + 1e-9), bins + 1)
+
+    inside = finite & (x >= x_edges[0]) & (x <= x_edges[-1]) & (y >= y_edges[0]) & (y <= y_edges[-1])
+    counts, _, _ = np.histogram2d(x[inside], y[inside], bins=[x_edges, y_edges])
+    ix = np.clip(np.searchsorted(x_edges, x[inside], side='right') - 1, 0, bins - 1)
+    iy = np.clip(np.searchsorted(y_edges, y[inside], side='right') - 1, 0, bins - 1)
+    density = np.zeros(len(x))
+    density[inside] = counts[ix, iy]
+
+    outliers = np.flatnonzero(inside & (density <= outlier_count))
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.argsort(density[outliers], kind='stable')[:max_outliers]]
+    return counts, x_edges, y_edges, outliers
+
+def hour_amount_density(df, amount_bins=20, amount_quantile=0.99):
+
+    hour_edges = np.arange(25, dtype=float)
+    amount_cap = max(float(df['Amount'].quantile(amount_quantile)), 1.0)
+    amount_edges = np.linspace(0, amount_cap, amount_bins + 1)
+    grid = density_grid(df['transaction_hour'], df['Amount'], hour_edges, amount_edges,
+                        weights=df['Class'] if 'Class' in df.columns else None)
+    grid = grid.rename(columns={'x_left': 'hour', 'y_left': 'amount_left', 'y_right': 'amount_right',
+                                'weight': 'fraud_count'}).drop(columns='x_right')
+    grid['hour'] = grid['hour'].astype(int)
+    return grid
+
+def category_counts(df, category, hue):
+
+    return df.groupby([category, hue]).size().reset_index(name='count')
+
+def save_summary(summary, name):
+
+    path = os.path.join(DATA_DIR, f"{name}.csv")
+    summary.to_csv(path, index=False)
+    return path
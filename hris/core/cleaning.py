@@ -13,33 +13,44 @@ def load_data(path):
         raise FileNotFoundError(f"File not found: {path}. Please ensure raw data is in the data/ directory.")
     return pd.read_csv(path)
 
-def clean_credit_data(df):
+def prepare_credit_data(df):
 
-    print("Cleaning Credit Data...")
     df['MonthlyIncome'] = df['MonthlyIncome'].fillna(df['MonthlyIncome'].median())
     df['NumberOfDependents'] = df['NumberOfDependents'].fillna(0)
     df = df[df['age'] > 18].copy()
     
     cap_debt = df['DebtRatio'].quantile(0.99)
     df['DebtRatio'] = np.where(df['DebtRatio'] > cap_debt, cap_debt, df['DebtRatio'])
-    
-    np.random.seed(42)
+    return df
+
+def simulate_credit_fields(df, seed=42):
+
+    np.random.seed(seed)
     df['LoanAmount'] = df['MonthlyIncome'] * np.random.uniform(5, 20, size=len(df))
     df['LoanAmount'] = df['LoanAmount'].apply(lambda x: max(1000, round(x, -2)))
     df['TotalMonthlyDebt'] = df['MonthlyIncome'] * df['DebtRatio']
     df['emi_to_income_ratio'] = df['DebtRatio']
     df.rename(columns={'DebtRatio': 'debt_to_income_ratio'}, inplace=True)
     df['MonthlyIncome'] = df['MonthlyIncome'].astype(int)
-    
+    return df
+
+def clean_credit_data(df, seed=42):
+
+    print("Cleaning Credit Data...")
+    df = simulate_credit_fields(prepare_credit_data(df), seed)
     print(f"Credit Data Cleaned: {df.shape}")
     return df
 
-def clean_fraud_data(df):
+def prepare_fraud_data(df):
 
-    print("Cleaning Fraud Data...")
     df['transaction_hour'] = (df['Time'] // 3600) % 24
-    
-    np.random.seed(42)
+    df['transaction_amount_zscore'] = (df['Amount'] - df['Amount'].mean()) / df['Amount'].std()
+    df['relative_day'] = df['Time'] // 86400
+    return df
+
+def simulate_fraud_fields(df, seed=42):
+
+    np.random.seed(seed)
     n = len(df)
     categories = ['Grocery', 'Electronics', 'Jewelry', 'Gambling', 'Utilities', 'Travel']
     weights = [0.4, 0.2, 0.1, 0.05, 0.15, 0.1]
@@ -50,16 +61,15 @@ def clean_fraud_data(df):
     
     cities = ['New York', 'London', 'Paris', 'Tokyo', 'Mumbai', 'Sydney', 'Berlin', 'Toronto']
     df['City'] = np.random.choice(cities, size=n)
-    
-    mean_amt = df['Amount'].mean()
-    std_amt = df['Amount'].std()
-    df['transaction_amount_zscore'] = (df['Amount'] - mean_amt) / std_amt
     df['CustomerID'] = np.random.randint(1000, 6000, size=n)
     
-    df['relative_day'] = df['Time'] // 86400
     velocity = df.groupby(['CustomerID', 'relative_day', 'transaction_hour']).size().reset_index(name='transaction_velocity')
-    df = df.merge(velocity, on=['CustomerID', 'relative_day', 'transaction_hour'], how='left')
-    
+    return df.merge(velocity, on=['CustomerID', 'relative_day', 'transaction_hour'], how='left')
+
+def clean_fraud_data(df, seed=42):
+
+    print("Cleaning Fraud Data...")
+    df = simulate_fraud_fields(prepare_fraud_data(df), seed)
     print(f"Fraud Data Cleaned: {df.shape}")
     return df
 
@@ -0,0 +1,41 @@
+
+import os
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+ROW_GROUP_SIZE = 122880
+
+def parquet_path(csv_path):
+
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+def _literal(value):
+
+    return "'" + value.replace("'", "''") + "'"
+
+def write_parquet(df, path):
+
+    staging = f"{path}.tmp"
+    if duckdb is None:
+        try:
+            df.to_parquet(staging, index=False, row_group_size=ROW_GROUP_SIZE)
+        except ImportError:
+            return None
+    else:
+        con = duckdb.connect()
+        try:
+            con.register('frame', df)
+            con.execute(f"COPY frame TO {_literal(staging)} (FORMAT PARQUET, ROW_GROUP_SIZE {ROW_GROUP_SIZE})")
+        finally:
+            con.close()
+    os.replace(staging, path)
+    return path
+
+def write_outputs(df, csv_path):
+
+    df.to_csv(csv_path, index=False)
+    write_parquet(df, parquet_path(csv_path))
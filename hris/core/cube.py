@@ -0,0 +1,111 @@
+
+import pandas as pd
+import numpy as np
+import os
+from hris.core.segments import assign_risk_segment
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+TRANSACTION_CUBE_PATH = os.path.join(DATA_DIR, 'risk_cube_transactions.csv')
+CREDIT_CUBE_PATH = os.path.join(DATA_DIR, 'risk_cube_credit.csv')
+
+TRANSACTION_DIMS = ['risk_band', 'transaction_hour', 'MerchantCategory', 'is_high_risk_merchant', 'City', 'relative_day']
+CREDIT_DIMS = ['risk_band', 'risk_segment']
+CREDIT_SUM_COLUMNS = ['MonthlyIncome', 'debt_to_income_ratio', 'age', 'LoanAmount']
+DENSE_CELL_LIMIT = 1 << 24
+
+def build_cube(df, dims, score_col, label_col=None, sum_cols=()):
+
+    codes, levels = [], []
+    for dim in dims:
+        dim_codes, dim_levels = pd.factorize(df[dim], sort=True, use_na_sentinel=False)
+        codes.append(dim_codes)
+        levels.append(dim_levels)
+    shape = tuple(len(lv) for lv in levels)
+    n_cells = int(np.prod(shape, dtype=np.int64))
+
+    flat = np.ravel_multi_index(codes, shape) if len(df) else np.zeros(0, dtype=np.int64)
+    if n_cells <= DENSE_CELL_LIMIT:
+        cells = np.arange(n_cells)
+        index = flat
+    else:
+        cells, index = np.unique(flat, return_inverse=True)
+    size = len(cells)
+
+    scores = df[score_col].to_numpy(dtype=float)
+    measures = {
+        'count': np.bincount(index, minlength=size),
+        'score_sum': np.bincount(index, weights=scores, minlength=size)
+    }
+    score_max = np.full(size, -np.inf)
+    np.maximum.at(score_max, index, scores)
+    measures['score_max'] = score_max
+    if label_col is not None:
+        measures['fraud_count'] = np.bincount(index, weights=df[label_col].to_numpy(dtype=float), minlength=size)
+    for col in sum_cols:
+        measures[f"{col}_sum"] = np.bincount(index, weights=df[col].to_numpy(dtype=float), minlength=size)
+
+    keep = measures['count'] > 0
+    dim_codes = np.unravel_index(cells[keep], shape)
+    cube = pd.DataFrame({dim: levels[i][dim_codes[i]] for i, dim in enumerate(dims)})
+    for name, values in measures.items():
+        cube[name] = values[keep]
+    return cube
+
+def slice_cube(cube, by, **filters):
+
+    for dim, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            cube = cube[cube[dim].isin(value)]
+        else:
+            cube = cube[cube[dim] == value]
+    sums = [c for c in cube.columns if c in ('count', 'score_sum', 'fraud_count') or c.endswith('_sum')]
+    agg = {c: 'sum' for c in sums}
+    agg['score_max'] = 'max'
+    if by:
+        sliced = cube.groupby(by, as_index=False).agg(agg)
+    else:
+        sliced = cube.agg(agg).to_frame().T
+    sliced['score_mean'] = sliced['score_sum'] / sliced['count']
+    return sliced
+
+def build_transaction_cube(fraud_scored):
+
+    return build_cube(fraud_scored, TRANSACTION_DIMS, 'fraud_risk_score',
+                      label_col='Class' if 'Class' in fraud_scored.columns else None)
+
+def build_credit_cube(credit_scored):
+
+    return build_cube(credit_scored, CREDIT_DIMS, 'credit_risk_score',
+                      label_col='SeriousDlqin2yrs', sum_cols=CREDIT_SUM_COLUMNS)
+
+def materialize_risk_cubes(credit_scored=None, fraud_scored=None):
+
+    if fraud_scored is not None:
+        build_transaction_cube(fraud_scored).to_csv(TRANSACTION_CUBE_PATH, index=False)
+    if credit_scored is not None:
+        if 'risk_segment' not in credit_scored.columns:
+            credit_scored = assign_risk_segment(credit_scored.copy())
+        build_credit_cube(credit_scored).to_csv(CREDIT_CUBE_PATH, index=False)
+    print("Risk cubes materialized.")
+
+def load_cube(path):
+
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path)
+
+def monthly_stats_from_cube(cube):
+
+    cube = cube.assign(Month=(pd.Timestamp('2024-01-01') + pd.to_timedelta(cube['relative_day'], unit='D')).dt.to_period('M'))
+    monthly = slice_cube(cube, ['Month'])
+    high = slice_cube(cube, ['Month'], risk_band='High Risk').set_index('Month')['count']
+    monthly_stats = pd.DataFrame({
+        'Month': monthly['Month'],
+        'Avg_Risk_Score': monthly['score_mean'],
+        'Total_Txns': monthly['count'],
+        'High_Risk_Flags': monthly['Month'].map(high).fillna(0).astype(int)
+    })
+    monthly_stats['Flag_Rate_Pct'] = (monthly_stats['High_Risk_Flags'] / monthly_stats['Total_Txns']) * 100
+    return monthly_stats
@@ -3,60 +3,89 @@ import pandas as pd
 import numpy as np
 import os
 from hris.utils.profiling import profile_runtime
+from hris.core.cube import materialize_risk_cubes
+from hris.core.feature_store import fraud_customer_features, upsert_features
+from hris.core.timeline import build_timeline
+from hris.core.columnar import write_outputs
+from hris.core.event_log import append_segment
+from hris.core.rule_hits import publish_rule_hits
 
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
-@profile_runtime
-def compute_credit_risk_score(df):
+CREDIT_RULES = [
+    ('high_dti', 25, "High DTI; "),
+    ('high_emi', 25, "High EMI Burden; "),
+    ('no_credit_history', 20, "No Credit History; "),
+    ('low_income', 10, "Low Income; "),
+    ('large_loan', 10, "Large Loan Request; "),
+]
+
+FRAUD_RULES = [
+    ('extreme_price_shock', 20, "Extreme Price Shock (>99th%); "),
+    ('high_value', 15, "High Value (>95th%); "),
+    ('extreme_value', 5, "Extreme Value (>99th%); "),
+    ('burst_activity', 25, "Burst Activity; "),
+    ('high_velocity', 15, "High Velocity; "),
+    ('illiquid_hours', 10, "Illiquid Hours; "),
+    ('high_risk_merchant', 15, "High Risk Merchant; "),
+    ('impossible_travel', 35, "Impossible Travel; "),
+]
+
+HIGH_RISK_CUTOFF = 70
+MEDIUM_RISK_CUTOFF = 40
+
+def assign_risk_band(scores, high=HIGH_RISK_CUTOFF, medium=MEDIUM_RISK_CUTOFF):
 
-    print("Computing Credit Risk Scores...")
-    df['credit_risk_score'] = 0
-    df['risk_reason_summary'] = ""
-    
-    dti_thresh = df['debt_to_income_ratio'].quantile(0.80)
-    mask_dti = df['debt_to_income_ratio'] > dti_thresh
-    df.loc[mask_dti, 'credit_risk_score'] += 25
-    df.loc[mask_dti, 'risk_reason_summary'] += "High DTI; "
-    
-    emi_thresh = df['emi_to_income_ratio'].quantile(0.80)
-    mask_emi = df['emi_to_income_ratio'] > emi_thresh
-    df.loc[mask_emi, 'credit_risk_score'] += 25
-    df.loc[mask_emi, 'risk_reason_summary'] += "High EMI Burden; "
-    
-    no_history = (df['NumberOfOpenCreditLinesAndLoans'] == 0) & (df['NumberRealEstateLoansOrLines'] == 0)
-    df.loc[no_history, 'credit_risk_score'] += 20
-    df.loc[no_history, 'risk_reason_summary'] += "No Credit History; "
-    
-    income_thresh = df['MonthlyIncome'].quantile(0.10)
-    mask_income = df['MonthlyIncome'] < income_thresh
-    df.loc[mask_income, 'credit_risk_score'] += 10
-    df.loc[mask_income, 'risk_reason_summary'] += "Low Income; "
-    
-    high_loan_thresh = df['LoanAmount'].quantile(0.75)
-    mask_loan = df['LoanAmount'] > high_loan_thresh
-    df.loc[mask_loan, 'credit_risk_score'] += 10
-    df.loc[mask_loan, 'risk_reason_summary'] += "Large Loan Request; "
-    
-    df['credit_risk_score'] = df['credit_risk_score'].clip(upper=100)
-    
     conditions = [
-        (df['credit_risk_score'] >= 70),
-        (df['credit_risk_score'] >= 40)
+        (scores >= high),
+        (scores >= medium)
     ]
     choices = ['High Risk', 'Medium Risk']
-    df['risk_band'] = np.select(conditions, choices, default='Low Risk')
-    
+    return np.select(conditions, choices, default='Low Risk')
+
+def apply_rules(df, hits, rules, score_col):
+
+    df[score_col] = 0
+    df['risk_reason_summary'] = ""
+    for name, weight, reason in rules:
+        mask = hits[name]
+        df.loc[mask, score_col] += weight
+        df.loc[mask, 'risk_reason_summary'] += reason
+    df[score_col] = df[score_col].clip(upper=100)
+    df['risk_band'] = assign_risk_band(df[score_col])
     return df
 
+def fit_credit_thresholds(df):
+
+    return {
+        'dti': df['debt_to_income_ratio'].quantile(0.80),
+        'emi': df['emi_to_income_ratio'].quantile(0.80),
+        'income': df['MonthlyIncome'].quantile(0.10),
+        'loan': df['LoanAmount'].quantile(0.75)
+    }
+
+def credit_rule_hits(df, thresholds):
+
+    return {
+        'high_dti': df['debt_to_income_ratio'] > thresholds['dti'],
+        'high_emi': df['emi_to_income_ratio'] > thresholds['emi'],
+        'no_credit_history': (df['NumberOfOpenCreditLinesAndLoans'] == 0) & (df['NumberRealEstateLoansOrLines'] == 0),
+        'low_income': df['MonthlyIncome'] < thresholds['income'],
+        'large_loan': df['LoanAmount'] > thresholds['loan']
+    }
+
 @profile_runtime
-def compute_transaction_risk_score(df):
+def compute_credit_risk_score(df, return_hits=False):
+
+    print("Computing Credit Risk Scores...")
+    hits = credit_rule_hits(df, fit_credit_thresholds(df))
+    df = apply_rules(df, hits, CREDIT_RULES, 'credit_risk_score')
+    return (df, rule_hit_matrix(hits, CREDIT_RULES)) if return_hits else df
+
+def add_velocity_features(df):
 
-    print("Computing Transaction Risk Scores...")
-    df['fraud_risk_score'] = 0
-    df['risk_reason_summary'] = ""
-    
     df['datetime'] = pd.to_datetime(df['Time'], unit='s', origin='2024-01-01')
     df = df.sort_values(by=['CustomerID', 'datetime'])
     
@@ -65,81 +94,98 @@ def compute_transaction_risk_score(df):
     
     df['txn_count_5min'] = grouped.rolling('5min').count().values
     df['txn_count_1h'] = grouped.rolling('1h').count().values
+    return df
 
-    thresh_95 = df['Amount'].quantile(0.95)
-    thresh_99 = df['Amount'].quantile(0.99)
-    
-    mask_99 = df['Amount'] > thresh_99
-    df.loc[mask_99, 'fraud_risk_score'] += 20
-    df.loc[mask_99, 'risk_reason_summary'] += "Extreme Price Shock (>99th%); "
-    
-    mask_95_all = df['Amount'] > thresh_95
-    df.loc[mask_95_all, 'fraud_risk_score'] += 15
-    df.loc[mask_95_all, 'risk_reason_summary'] += "High Value (>95th%); "
-    
-    mask_99_add = df['Amount'] > thresh_99
-    df.loc[mask_99_add, 'fraud_risk_score'] += 5
-    df.loc[mask_99_add, 'risk_reason_summary'] += "Extreme Value (>99th%); "
-    
-    burst_thresh = df['txn_count_5min'].quantile(0.995) 
-    velocity_thresh = df['txn_count_1h'].quantile(0.99)
-    burst_thresh = max(burst_thresh, 5)
-    velocity_thresh = max(velocity_thresh, 10)
-    
-    mask_burst = df['txn_count_5min'] > burst_thresh
-    df.loc[mask_burst, 'fraud_risk_score'] += 25
-    df.loc[mask_burst, 'risk_reason_summary'] += "Burst Activity; "
-    
-    mask_velocity = df['txn_count_1h'] > velocity_thresh
-    df.loc[mask_velocity, 'fraud_risk_score'] += 15
-    df.loc[mask_velocity, 'risk_reason_summary'] += "High Velocity; "
+def fit_fraud_thresholds(df, quantile=None):
+
+    quantile = quantile or (lambda col, q: df[col].quantile(q))
+    return {
+        'amount_95': quantile('Amount', 0.95),
+        'amount_99': quantile('Amount', 0.99),
+        'burst': max(quantile('txn_count_5min', 0.995), 5),
+        'velocity': max(quantile('txn_count_1h', 0.99), 10)
+    }
+
+def fraud_rule_hits(df, thresholds):
 
-    mask_night = df['transaction_hour'].isin([2, 3, 4])
-    df.loc[mask_night, 'fraud_risk_score'] += 10
-    df.loc[mask_night, 'risk_reason_summary'] += "Illiquid Hours; "
-    
-    if 'is_high_risk_merchant' in df.columns:
-        mask_merchant = df['is_high_risk_merchant'] == 1
-        df.loc[mask_merchant, 'fraud_risk_score'] += 15
-        df.loc[mask_merchant, 'risk_reason_summary'] += "High Risk Merchant; "
-    
     prev_city = df.groupby('CustomerID')['City'].shift(1)
     prev_time = df.groupby('CustomerID')['Time'].shift(1)
-    
     geo_inconsistency = (
         (df['City'] != prev_city) & 
         (pd.notnull(prev_city)) &
         ((df['Time'] - prev_time) <= 3600)
     )
-    df.loc[geo_inconsistency, 'fraud_risk_score'] += 35
-    df.loc[geo_inconsistency, 'risk_reason_summary'] += "Impossible Travel; "
-    
-    df['fraud_risk_score'] = df['fraud_risk_score'].clip(upper=100)
-    
-    conditions = [
-        (df['fraud_risk_score'] >= 70),
-        (df['fraud_risk_score'] >= 40)
-    ]
-    choices = ['High Risk', 'Medium Risk']
-    df['risk_band'] = np.select(conditions, choices, default='Low Risk')
-    
-    return df
+    if 'is_high_risk_merchant' in df.columns:
+        high_risk_merchant = df['is_high_risk_merchant'] == 1
+    else:
+        high_risk_merchant = pd.Series(False, index=df.index)
+
+    return {
+        'extreme_price_shock': df['Amount'] > thresholds['amount_99'],
+        'high_value': df['Amount'] > thresholds['amount_95'],
+        'extreme_value': df['Amount'] > thresholds['amount_99'],
+        'burst_activity': df['txn_count_5min'] > thresholds['burst'],
+        'high_velocity': df['txn_count_1h'] > thresholds['velocity'],
+        'illiquid_hours': df['transaction_hour'].isin([2, 3, 4]),
+        'high_risk_merchant': high_risk_merchant,
+        'impossible_travel': geo_inconsistency
+    }
+
+def rule_hit_matrix(hits, rules):
+
+    return np.column_stack([np.asarray(hits[name], dtype=np.uint8) for name, _, _ in rules])
+
+@profile_runtime
+def compute_transaction_risk_score(df, return_hits=False):
+
+    print("Computing Transaction Risk Scores...")
+    df['fraud_risk_score'] = 0
+    df['risk_reason_summary'] = ""
+    df = add_velocity_features(df)
+    hits = fraud_rule_hits(df, fit_fraud_thresholds(df))
+    df = apply_rules(df, hits, FRAUD_RULES, 'fraud_risk_score')
+    return (df, rule_hit_matrix(hits, FRAUD_RULES)) if return_hits else df
 
-def run_scoring_engine():
-    CREDIT_CLEAN_PATH = os.path.join(DATA_DIR, 'cleaned_credit_data.csv')
-    FRAUD_CLEAN_PATH = os.path.join(DATA_DIR, 'cleaned_transaction_data.csv')
+def run_scoring_engine(only=None, credit_input=None, fraud_input=None):
+    CREDIT_CLEAN_PATH = credit_input or os.path.join(DATA_DIR, 'cleaned_credit_data.csv')
+    FRAUD_CLEAN_PATH = fraud_input or os.path.join(DATA_DIR, 'cleaned_transaction_data.csv')
     CREDIT_SCORES_PATH = os.path.join(DATA_DIR, 'credit_risk_scores.csv')
     FRAUD_SCORES_PATH = os.path.join(DATA_DIR, 'fraud_risk_scores.csv')
 
-    credit_df = pd.read_csv(CREDIT_CLEAN_PATH)
-    fraud_df = pd.read_csv(FRAUD_CLEAN_PATH)
-    
-    credit_scored = compute_credit_risk_score(credit_df)
-    fraud_scored = compute_transaction_risk_score(fraud_df)
-    
-    credit_scored.to_csv(CREDIT_SCORES_PATH, index=False)
-    fraud_scored.to_csv(FRAUD_SCORES_PATH, index=False)
+    credit_scored = fraud_scored = None
+    if only in (None, 'credit'):
+        credit_df = pd.read_csv(CREDIT_CLEAN_PATH)
+        credit_scored, credit_hits = compute_credit_risk_score(credit_df, return_hits=True)
+        write_outputs(credit_scored, CREDIT_SCORES_PATH)
+        publish_rule_hits('credit', credit_hits, CREDIT_RULES, HIGH_RISK_CUTOFF, MEDIUM_RISK_CUTOFF)
+
+    if only in (None, 'fraud'):
+        fraud_df = pd.read_csv(FRAUD_CLEAN_PATH)
+        fraud_scored, fraud_hits = compute_transaction_risk_score(fraud_df, return_hits=True)
+        write_outputs(fraud_scored, FRAUD_SCORES_PATH)
+        publish_rule_hits('fraud', fraud_hits, FRAUD_RULES, HIGH_RISK_CUTOFF, MEDIUM_RISK_CUTOFF)
+        upsert_features(fraud_customer_features(fraud_scored))
+        build_timeline(fraud_scored)
+        append_segment(fraud_scored.sort_values('Time', kind='stable'))
+
+    materialize_risk_cubes(credit_scored, fraud_scored)
     print("Scoring complete.")
 
 if __name__ == "__main__":
-    run_scoring_engine()
+    import argparse
+    from hris.utils.profiling import enable_profiling
+
+    parser = argparse.ArgumentParser(description="Run the HRIS rule-based scoring engine.")
+    parser.add_argument('--only', choices=['credit', 'fraud'], help="Score a single dataset")
+    parser.add_argument('--credit-input', help="Cleaned credit CSV to score instead of the pipeline output")
+    parser.add_argument('--fraud-input', help="Cleaned transaction CSV to score instead of the pipeline output")
+    parser.add_argument('--profile', type=lambda v: v.split(','), default=[],
+                        help="Scorers to profile: compute_credit_risk_score, compute_transaction_risk_score or all")
+    parser.add_argument('--profile-mode', choices=['sample', 'cprofile'], default='sample')
+    parser.add_argument('--profile-interval', type=float, default=0.005)
+    parser.add_argument('--profile-top', type=int, default=25)
+    args = parser.parse_args()
+
+    if args.profile:
+        enable_profiling(args.profile, mode=args.profile_mode, interval=args.profile_interval, top=args.profile_top)
+    run_scoring_engine(args.only, args.credit_input, args.fraud_input)
@@ -0,0 +1,84 @@
+
+import os
+import json
+import pandas as pd
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+EVENT_LOG_DIR = os.path.join(DATA_DIR, 'event_log')
+CHECKPOINT_NAME = 'checkpoint.json'
+HISTORY_SEGMENTS = 100
+
+EVENT_COLUMNS = ['Time', 'CustomerID', 'Amount', 'MerchantCategory', 'City', 'fraud_risk_score', 'risk_band', 'Class']
+
+def list_segments(log_dir=EVENT_LOG_DIR):
+
+    if not os.path.isdir(log_dir):
+        return []
+    return sorted(int(name[:-4]) for name in os.listdir(log_dir) if name.endswith('.csv'))
+
+def segment_path(seq, log_dir=EVENT_LOG_DIR):
+
+    return os.path.join(log_dir, f"{seq:010d}.csv")
+
+def empty_checkpoint():
+
+    return {'offset': -1, 'watermark': None, 'transactions': 0, 'flagged': 0, 'score_sum': 0.0, 'confirmed_fraud': 0,
+            'segments': []}
+
+def load_checkpoint(log_dir=EVENT_LOG_DIR):
+
+    path = os.path.join(log_dir, CHECKPOINT_NAME)
+    if not os.path.exists(path):
+        return empty_checkpoint()
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(state, log_dir=EVENT_LOG_DIR):
+
+    staging = os.path.join(log_dir, f"{CHECKPOINT_NAME}.tmp")
+    with open(staging, 'w') as f:
+        json.dump(state, f)
+    os.replace(staging, os.path.join(log_dir, CHECKPOINT_NAME))
+
+def fold_segment(state, seq, events, history=HISTORY_SEGMENTS):
+
+    transactions = len(events)
+    flagged = int((events['risk_band'] == 'High Risk').sum())
+    state['offset'] = seq
+    state['transactions'] += transactions
+    state['flagged'] += flagged
+    state['score_sum'] += float(events['fraud_risk_score'].sum())
+    state['confirmed_fraud'] += int(events['Class'].sum()) if 'Class' in events.columns else 0
+    if transactions:
+        latest = float(events['Time'].max())
+        state['watermark'] = latest if state['watermark'] is None else max(state['watermark'], latest)
+    state['segments'].append({'segment': seq, 'transactions': transactions, 'flagged': flagged,
+                              'flag_rate_pct': flagged / transactions * 100 if transactions else 0.0})
+    del state['segments'][:-history]
+    return state
+
+def append_segment(events, log_dir=EVENT_LOG_DIR):
+
+    state = load_checkpoint(log_dir)
+    if state['watermark'] is not None:
+        events = events[events['Time'] > state['watermark']]
+    if events.empty:
+        return None
+    os.makedirs(log_dir, exist_ok=True)
+    segments = list_segments(log_dir)
+    seq = segments[-1] + 1 if segments else 0
+    columns = [c for c in EVENT_COLUMNS if c in events.columns]
+    staging = os.path.join(log_dir, f"{seq:010d}.tmp")
+    events[columns].to_csv(staging, index=False)
+    os.replace(staging, segment_path(seq, log_dir))
+    save_checkpoint(fold_segment(state, seq, events), log_dir)
+    return seq
+
+def read_segments(after=-1, log_dir=EVENT_LOG_DIR):
+
+    seq = after + 1
+    while os.path.exists(segment_path(seq, log_dir)):
+        yield seq, pd.read_csv(segment_path(seq, log_dir))
+        seq += 1
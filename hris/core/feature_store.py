@@ -0,0 +1,91 @@
+
+import os
+import sqlite3
+import pandas as pd
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+FEATURE_STORE_PATH = os.path.join(DATA_DIR, 'customer_features.db')
+
+FEATURE_COLUMNS = {
+    'credit_risk_score': 'REAL',
+    'credit_risk_band': 'TEXT',
+    'fraud_risk_score': 'REAL',
+    'fraud_risk_band': 'TEXT',
+    'txn_count_5min': 'REAL',
+    'txn_count_1h': 'REAL',
+    'last_city': 'TEXT',
+    'last_txn_time': 'REAL',
+    'hybrid_risk_score': 'REAL',
+    'hybrid_risk_status': 'TEXT'
+}
+
+class FeatureStore:
+
+    def __init__(self, path=FEATURE_STORE_PATH, read_only=False):
+        if read_only:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            columns = ', '.join(f"{name} {kind}" for name, kind in FEATURE_COLUMNS.items())
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS customer_features "
+                              f"(CustomerID INTEGER PRIMARY KEY, {columns}, updated_at REAL)")
+        self.conn.row_factory = sqlite3.Row
+
+    def upsert(self, features):
+        columns = [c for c in features.columns if c in FEATURE_COLUMNS]
+        if not columns or features.empty:
+            return 0
+        placeholders = ', '.join('?' * (len(columns) + 2))
+        updates = ', '.join(f"{c}=excluded.{c}" for c in columns + ['updated_at'])
+        sql = (f"INSERT INTO customer_features (CustomerID, {', '.join(columns)}, updated_at) "
+               f"VALUES ({placeholders}) ON CONFLICT(CustomerID) DO UPDATE SET {updates}")
+        frame = features[['CustomerID'] + columns].astype(object)
+        frame = frame.where(frame.notna(), None)
+        frame['updated_at'] = pd.Timestamp.now().timestamp()
+        with self.conn:
+            self.conn.executemany(sql, frame.itertuples(index=False, name=None))
+        return len(frame)
+
+    def get(self, customer_id):
+        row = self.conn.execute("SELECT * FROM customer_features WHERE CustomerID = ?", (int(customer_id),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def fraud_customer_features(fraud_scored):
+
+    ordered = fraud_scored.sort_values(['CustomerID', 'Time'], kind='stable')
+    latest = ordered.groupby('CustomerID', sort=True).tail(1)
+    features = pd.DataFrame({
+        'CustomerID': latest['CustomerID'].to_numpy(),
+        'txn_count_5min': latest['txn_count_5min'].to_numpy(),
+        'txn_count_1h': latest['txn_count_1h'].to_numpy(),
+        'last_city': latest['City'].to_numpy(),
+        'last_txn_time': latest['Time'].to_numpy()
+    })
+    worst = ordered.groupby('CustomerID', sort=True)['fraud_risk_score'].max()
+    features['fraud_risk_score'] = worst.to_numpy()
+    return features
+
+def hybrid_customer_features(hybrid_df):
+
+    return hybrid_df[['CustomerID', 'credit_risk_score', 'credit_risk_band', 'fraud_risk_band',
+                      'hybrid_risk_score', 'hybrid_risk_status']]
+
+def upsert_features(features, path=FEATURE_STORE_PATH):
+
+    with FeatureStore(path) as store:
+        count = store.upsert(features)
+    print(f"Upserted {count:,} customers into the feature store.")
+    return count
@@ -0,0 +1,21 @@
+
+import numpy as np
+import os
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+def rule_hits_path(portfolio):
+
+    return os.path.join(DATA_DIR, f"rule_hits_{portfolio}.npz")
+
+def publish_rule_hits(portfolio, matrix, rules, high, medium):
+
+    np.savez(rule_hits_path(portfolio),
+             bits=np.packbits(matrix.astype(bool), axis=0),
+             rows=len(matrix),
+             names=np.array([name for name, _, _ in rules]),
+             reasons=np.array([reason for _, _, reason in rules]),
+             weights=np.array([weight for _, weight, _ in rules], dtype=float),
+             cutoffs=np.array([medium, high], dtype=float))
@@ -0,0 +1,14 @@
+
+import numpy as np
+
+
+def assign_risk_segment(df):
+
+    conditions = [
+        (df['SeriousDlqin2yrs'] == 1),
+        (df['debt_to_income_ratio'] > 0.6) | (df['NumberOfTimes90DaysLate'] > 0),
+        (df['MonthlyIncome'] > 5000) & (df['debt_to_income_ratio'] < 0.3)
+    ]
+    choices = ['High Risk (Delinquent)', 'Medium Risk (High DTI/Late)', 'Low Risk (Prime)']
+    df['risk_segment'] = np.select(conditions, choices, default='Medium Risk')
+    return df
@@ -0,0 +1,110 @@
+
+import functools
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+TIMELINE_DIR = os.path.join(DATA_DIR, 'customer_timeline')
+POINTER_NAME = 'current.json'
+KEEP_VERSIONS = 2
+
+def timeline_pointer(path=TIMELINE_DIR):
+
+    return os.path.join(path, POINTER_NAME)
+
+def current_version(path=TIMELINE_DIR):
+
+    with open(timeline_pointer(path)) as f:
+        return os.path.join(path, json.load(f)['version'])
+
+def _prune_versions(path, keep):
+
+    for name in os.listdir(path):
+        if name == POINTER_NAME or name in keep:
+            continue
+        target = os.path.join(path, name)
+        if os.path.isdir(target):
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            os.remove(target)
+
+def build_timeline(fraud_scored, path=TIMELINE_DIR):
+
+    ids = fraud_scored['CustomerID'].to_numpy(dtype=np.int64)
+    order = np.lexsort((fraud_scored['Time'].to_numpy(), ids))
+    ids = ids[order]
+    base = int(ids[0]) if len(ids) else 0
+    size = int(ids[-1]) - base + 1 if len(ids) else 0
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ids - base, minlength=size), out=offsets[1:])
+
+    os.makedirs(path, exist_ok=True)
+    versions = sorted(name for name in os.listdir(path) if name.startswith('v') and name[1:].isdigit())
+    version = f"v{int(versions[-1][1:]) + 1 if versions else 0:06d}"
+    staging = os.path.join(path, f"{version}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    np.save(os.path.join(staging, 'offsets.npy'), offsets)
+    categories = {}
+    for col in fraud_scored.columns:
+        values = fraud_scored[col].to_numpy()[order]
+        if values.dtype == object or pd.api.types.is_string_dtype(fraud_scored[col]):
+            values, levels = pd.factorize(values, use_na_sentinel=False)
+            categories[col] = levels.tolist()
+            values = values.astype(np.int32)
+        np.save(os.path.join(staging, f"{col}.npy"), values)
+    with open(os.path.join(staging, 'meta.json'), 'w') as f:
+        json.dump({'base': base, 'rows': len(ids), 'columns': list(fraud_scored.columns),
+                   'categories': categories}, f)
+
+    os.replace(staging, os.path.join(path, version))
+    pointer = timeline_pointer(path)
+    with open(f"{pointer}.tmp", 'w') as f:
+        json.dump({'version': version}, f)
+    os.replace(f"{pointer}.tmp", pointer)
+    _prune_versions(path, set(versions[len(versions) - KEEP_VERSIONS + 1:]) | {version})
+    load_timeline.cache_clear()
+    print(f"Customer timeline indexed: {len(ids):,} transactions over {size:,} customer slots.")
+
+class CustomerTimeline:
+
+    def __init__(self, path=TIMELINE_DIR):
+        path = current_version(path)
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.base = meta['base']
+        self.categories = {col: np.array(levels, dtype=object) for col, levels in meta['categories'].items()}
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+        self.columns = {col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r', allow_pickle=False)
+                        for col in meta['columns']}
+
+    def row_range(self, customer_id):
+        slot = int(customer_id) - self.base
+        if slot < 0 or slot >= len(self.offsets) - 1:
+            return 0, 0
+        return int(self.offsets[slot]), int(self.offsets[slot + 1])
+
+    def history(self, customer_id, columns=None):
+        start, stop = self.row_range(customer_id)
+        return {col: self.columns[col][start:stop] for col in (columns or self.columns)}
+
+    def frame(self, customer_id, columns=None):
+        history = self.history(customer_id, columns)
+        for col, levels in self.categories.items():
+            if col in history:
+                history[col] = levels[history[col]]
+        return pd.DataFrame(history)
+
+@functools.lru_cache(maxsize=4)
+def load_timeline(path=TIMELINE_DIR):
+
+    return CustomerTimeline(path)
+
+def get_customer_history(customer_id, columns=None, path=TIMELINE_DIR):
+
+    return load_timeline(path).history(customer_id, columns)
@@ -0,0 +1,119 @@
+
+import pandas as pd
+import numpy as np
+import os
+from hris.core.segments import assign_risk_segment
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+CAPACITY_PATH = os.path.join(DATA_DIR, 'review_capacity.csv')
+DEFAULT_REVIEW_CAPACITY = 100
+
+LADDER_SCOPES = {
+    ('hybrid', 'overall'): ('hybrid_risk_score', None),
+    ('credit', 'overall'): ('credit_risk_score', None),
+    ('credit', 'segment'): ('credit_risk_score', 'risk_segment'),
+    ('fraud', 'overall'): ('fraud_risk_score', None),
+    ('fraud', 'day'): ('fraud_risk_score', 'relative_day')
+}
+SEGMENT_INPUT_COLUMNS = ['SeriousDlqin2yrs', 'debt_to_income_ratio', 'NumberOfTimes90DaysLate', 'MonthlyIncome']
+
+class ScoreLadder:
+
+    def __init__(self, scores, groups=None):
+        scores = np.asarray(scores, dtype=float)
+        groups = np.zeros(len(scores), dtype=np.int8) if groups is None else np.asarray(groups)
+        keep = ~np.isnan(scores)
+        self.groups, codes = np.unique(groups[keep], return_inverse=True)
+        order = np.lexsort((scores[keep], codes))
+        self.scores = scores[keep][order]
+        self.bounds = np.searchsorted(codes[order], np.arange(len(self.groups) + 1))
+
+    def _slice(self, group=None):
+        if len(self.groups) == 0:
+            return self.scores
+        if group is None:
+            if len(self.groups) > 1:
+                raise ValueError("Grouped ladder needs a group; build an ungrouped ladder for totals.")
+            i = 0
+        else:
+            i = np.searchsorted(self.groups, group)
+            if i == len(self.groups) or self.groups[i] != group:
+                return self.scores[:0]
+        return self.scores[self.bounds[i]:self.bounds[i + 1]]
+
+    def volume(self, cutoff, group=None):
+        scores = self._slice(group)
+        return len(scores) - int(np.searchsorted(scores, cutoff, side='left'))
+
+    def cutoff_for_capacity(self, capacity, group=None):
+        scores = self._slice(group)
+        n = len(scores)
+        if n == 0:
+            return np.nan, 0
+        if capacity >= n:
+            return scores[0], n
+        j = n - max(int(capacity), 0)
+        if j < n and np.searchsorted(scores, scores[j], side='left') < j:
+            j = int(np.searchsorted(scores, scores[j], side='right'))
+        if j == n:
+            return np.nextafter(scores[-1], np.inf), 0
+        return scores[j], n - j
+
+    def group_cutoffs(self, capacity):
+        rows = []
+        for group in self.groups:
+            cutoff, volume = self.cutoff_for_capacity(capacity, group)
+            rows.append({'group': group, 'cutoff': cutoff, 'volume': volume, 'total': len(self._slice(group))})
+        return pd.DataFrame(rows, columns=['group', 'cutoff', 'volume', 'total'])
+
+    def uniform_cutoff(self, capacity):
+        per_group = self.group_cutoffs(capacity)
+        cutoff = per_group['cutoff'].max()
+        volumes = [self.volume(cutoff, group) for group in self.groups]
+        return cutoff, max(volumes, default=0)
+
+def ladder_columns(portfolio, scope):
+
+    score_column, group_column = LADDER_SCOPES[(portfolio, scope)]
+    if group_column == 'risk_segment':
+        return [score_column] + SEGMENT_INPUT_COLUMNS
+    return [score_column] + ([group_column] if group_column else [])
+
+def build_ladder(df, portfolio, scope):
+
+    score_column, group_column = LADDER_SCOPES[(portfolio, scope)]
+    if group_column == 'risk_segment' and group_column not in df.columns:
+        df = assign_risk_segment(df[[score_column] + SEGMENT_INPUT_COLUMNS].copy())
+    return ScoreLadder(df[score_column], df[group_column] if group_column else None)
+
+def capacity_report(credit_df, fraud_df, hybrid_df, capacity=DEFAULT_REVIEW_CAPACITY):
+
+    frames = {'hybrid': hybrid_df, 'credit': credit_df, 'fraud': fraud_df}
+    tables = []
+    for portfolio, scope in LADDER_SCOPES:
+        ladder = build_ladder(frames[portfolio], portfolio, scope)
+        table = ladder.group_cutoffs(capacity)
+        if scope == 'overall':
+            table['group'] = 'all'
+        else:
+            cutoff, volume = ladder.uniform_cutoff(capacity)
+            table.loc[len(table)] = ['uniform', cutoff, volume, len(ladder.scores)]
+        table.insert(0, 'scope', scope)
+        table.insert(0, 'portfolio', portfolio)
+        tables.append(table)
+    report = pd.concat(tables, ignore_index=True)
+    report.insert(len(report.columns), 'capacity', capacity)
+    return report
+
+def capacity_summary(report):
+
+    capacity = report['capacity'].iloc[0]
+    hybrid = report[report['portfolio'] == 'hybrid'].iloc[0]
+    daily = report[(report['portfolio'] == 'fraud') & (report['group'] == 'uniform')].iloc[0]
+    return pd.DataFrame({
+        'Metric': [f'Hybrid Cutoff for {capacity} Reviews', 'Hybrid Reviews at Cutoff',
+                   f'Fraud Cutoff for {capacity} Reviews/Day', 'Peak Daily Fraud Reviews at Cutoff'],
+        'Value': [f"{hybrid['cutoff']:.2f}", int(hybrid['volume']), f"{daily['cutoff']:.2f}", int(daily['volume'])]
+    })
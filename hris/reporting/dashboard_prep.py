@@ -2,71 +2,260 @@
 import pandas as pd
 import numpy as np
 import os
+from hris.core.engine import assign_risk_band
+from hris.core.columnar import write_outputs
+from hris.core.feature_store import hybrid_customer_features, upsert_features
+from hris.reporting.capacity import CAPACITY_PATH, DEFAULT_REVIEW_CAPACITY, capacity_report, capacity_summary
 from hris.utils.profiling import profile_runtime
 
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
+HYBRID_STATE_PATH = os.path.join(DATA_DIR, 'hybrid_customer_state.npz')
 
-@profile_runtime
-def generate_hybrid_report():
-    print("Generating Hybrid Risk Report...")
-    
-    CREDIT_SCORES_PATH = os.path.join(DATA_DIR, 'credit_risk_scores.csv')
-    FRAUD_SCORES_PATH = os.path.join(DATA_DIR, 'fraud_risk_scores.csv')
-    
-    credit_df = pd.read_csv(CREDIT_SCORES_PATH)
-    fraud_df = pd.read_csv(FRAUD_SCORES_PATH)
-    
+def customer_dimension(*id_arrays):
 
-    np.random.seed(42)
-    credit_df['CustomerID'] = np.random.randint(1000, 6000, size=len(credit_df))
-    credit_agg = credit_df.groupby('CustomerID').agg({
-        'credit_risk_score': 'max',
-        'risk_band': 'first',
-        'MonthlyIncome': 'mean'
-    }).reset_index()
-    
-
-    fraud_agg = fraud_df.groupby('CustomerID').agg({
-        'fraud_risk_score': 'max',
-        'risk_band': 'first',
-        'txn_count_1h': 'mean' 
-    }).reset_index()
-    
-    fraud_agg.rename(columns={'risk_band': 'fraud_risk_band'}, inplace=True)
-    credit_agg.rename(columns={'risk_band': 'credit_risk_band'}, inplace=True)
-    
-
-    hybrid_df = pd.merge(credit_agg, fraud_agg, on='CustomerID', how='inner')
-    
+    ids = [np.asarray(a, dtype=np.int64) for a in id_arrays if len(a)]
+    if not ids:
+        return 0, 0
+    base = min(a.min() for a in ids)
+    return int(base), int(max(a.max() for a in ids) - base + 1)
+
+def aggregate_customers(ids, base, size, scores, values):
+
+    offsets = np.asarray(ids, dtype=np.int64) - base
+    scores = np.asarray(scores)
+    score_max = np.full(size, scores.min() if len(scores) else 0, dtype=scores.dtype)
+    np.maximum.at(score_max, offsets, scores)
+    return {
+        'score_max': score_max,
+        'value_sum': np.bincount(offsets, weights=np.asarray(values, dtype=float), minlength=size),
+        'count': np.bincount(offsets, minlength=size)
+    }
+
+def merge_customer_aggregates(old, new):
+
+    return {
+        'score_max': np.where(old['count'] == 0, new['score_max'],
+                              np.where(new['count'] == 0, old['score_max'],
+                                       np.maximum(old['score_max'], new['score_max']))),
+        'value_sum': old['value_sum'] + new['value_sum'],
+        'count': old['count'] + new['count']
+    }
+
+def resize_aggregates(aggs, base, new_base, new_size):
+
+    shift = base - new_base
+    resized = {}
+    for name, values in aggs.items():
+        resized[name] = np.zeros(new_size, dtype=values.dtype)
+        resized[name][shift:shift + len(values)] = values
+    return resized
+
+def join_customer_aggregates(base, credit, fraud, offsets=None):
+
+    present = (credit['count'] > 0) & (fraud['count'] > 0)
+    present = np.flatnonzero(present) if offsets is None else offsets[present[offsets]]
+    return pd.DataFrame({
+        'CustomerID': present + base,
+        'credit_risk_score': credit['score_max'][present],
+        'credit_risk_band': assign_risk_band(credit['score_max'][present]),
+        'MonthlyIncome': credit['value_sum'][present] / credit['count'][present],
+        'fraud_risk_score': fraud['score_max'][present],
+        'fraud_risk_band': assign_risk_band(fraud['score_max'][present]),
+        'txn_count_1h': fraud['value_sum'][present] / fraud['count'][present]
+    })
+
+def assign_hybrid_status(hybrid_df):
 
     hybrid_df['hybrid_risk_score'] = (hybrid_df['credit_risk_score'] + hybrid_df['fraud_risk_score']) / 2
-    
+
     conditions = [
         (hybrid_df['hybrid_risk_score'] >= 70),
         (hybrid_df['hybrid_risk_score'] >= 40)
     ]
     choices = ['Hypersensitive', 'Moderate']
     hybrid_df['hybrid_risk_status'] = np.select(conditions, choices, default='Standard')
-    
+    return hybrid_df
+
+def assign_credit_customers(credit_df, seed=42):
+
+    np.random.seed(seed)
+    credit_df['CustomerID'] = np.random.randint(1000, 6000, size=len(credit_df))
+    return credit_df
+
+def fraud_watermark(fraud_df):
+
+    fraud_time = fraud_df['Time'].max() if len(fraud_df) else -np.inf
+    return fraud_time, int((fraud_df['Time'] == fraud_time).sum())
+
+def build_customer_state(credit_df, fraud_df, seed=42):
+
+    assign_credit_customers(credit_df, seed)
+    base, size = customer_dimension(credit_df['CustomerID'], fraud_df['CustomerID'])
+    fraud_time, fraud_tied = fraud_watermark(fraud_df)
+    return {
+        'base': base,
+        'credit': aggregate_customers(credit_df['CustomerID'], base, size, credit_df['credit_risk_score'],
+                                      credit_df['MonthlyIncome']),
+        'fraud': aggregate_customers(fraud_df['CustomerID'], base, size, fraud_df['fraud_risk_score'],
+                                     fraud_df['txn_count_1h']),
+        'credit_rows': len(credit_df),
+        'fraud_rows': len(fraud_df),
+        'fraud_time': fraud_time,
+        'fraud_tied': fraud_tied
+    }
+
+def state_extends(state, credit_df, fraud_df):
+
+    if state['credit_rows'] > len(credit_df):
+        return False
+    older = int((fraud_df['Time'] < state['fraud_time']).sum())
+    tied = int((fraud_df['Time'] == state['fraud_time']).sum())
+    return older == state['fraud_rows'] - state['fraud_tied'] and tied >= state['fraud_tied']
+
+def refresh_customer_state(state, credit_df, fraud_df, seed=42):
+
+    assign_credit_customers(credit_df, seed)
+    new_credit = credit_df.iloc[state['credit_rows']:]
+    at_watermark = fraud_df['Time'] == state['fraud_time']
+    late_ties = at_watermark & (at_watermark.cumsum() > state['fraud_tied'])
+    new_fraud = fraud_df[(fraud_df['Time'] > state['fraud_time']) | late_ties]
+
+    old_base, old_size = state['base'], len(state['credit']['count'])
+    known = [old_base, old_base + old_size - 1] if old_size else []
+    base, size = customer_dimension(known, new_credit['CustomerID'], new_fraud['CustomerID'])
+    credit = aggregate_customers(new_credit['CustomerID'], base, size, new_credit['credit_risk_score'],
+                                 new_credit['MonthlyIncome'])
+    fraud = aggregate_customers(new_fraud['CustomerID'], base, size, new_fraud['fraud_risk_score'],
+                                new_fraud['txn_count_1h'])
+    dirty = np.flatnonzero((credit['count'] > 0) | (fraud['count'] > 0))
+
+    refreshed = {
+        'base': base,
+        'credit': merge_customer_aggregates(resize_aggregates(state['credit'], old_base, base, size), credit),
+        'fraud': merge_customer_aggregates(resize_aggregates(state['fraud'], old_base, base, size), fraud),
+        'credit_rows': len(credit_df),
+        'fraud_rows': len(fraud_df)
+    }
+    refreshed['fraud_time'], refreshed['fraud_tied'] = fraud_watermark(fraud_df)
+    return refreshed, dirty
+
+def save_customer_state(state, path):
+
+    arrays = {f"{side}::{name}": values for side in ('credit', 'fraud') for name, values in state[side].items()}
+    np.savez(path, base=state['base'], credit_rows=state['credit_rows'], fraud_rows=state['fraud_rows'],
+             fraud_time=state['fraud_time'], fraud_tied=state['fraud_tied'], **arrays)
+
+def load_customer_state(path):
+
+    with np.load(path) as data:
+        if 'fraud_tied' not in data.files:
+            return None
+        state = {side: {name: data[f"{side}::{name}"] for name in ('score_max', 'value_sum', 'count')}
+                 for side in ('credit', 'fraud')}
+        state['base'] = int(data['base'])
+        state['credit_rows'] = int(data['credit_rows'])
+        state['fraud_rows'] = int(data['fraud_rows'])
+        state['fraud_time'] = float(data['fraud_time'])
+        state['fraud_tied'] = int(data['fraud_tied'])
+    return state
+
+def profiles_from_state(state, offsets=None):
+
+    return assign_hybrid_status(join_customer_aggregates(state['base'], state['credit'], state['fraud'], offsets))
+
+def patch_profiles(profiles, state, dirty, patch=None):
+
+    patch = profiles_from_state(state, dirty) if patch is None else patch
+    kept = profiles[~profiles['CustomerID'].isin(dirty + state['base'])]
+    return pd.concat([kept, patch], ignore_index=True).sort_values('CustomerID', ignore_index=True)
+
+def build_hybrid_profiles(credit_df, fraud_df, seed=42):
+
+    return profiles_from_state(build_customer_state(credit_df, fraud_df, seed))
+
+def hybrid_headline_metrics(hybrid_df):
 
     total_customers = len(hybrid_df)
     high_risk_count = (hybrid_df['hybrid_risk_status'] == 'Hypersensitive').sum()
     high_risk_pct = (high_risk_count / total_customers) * 100 if total_customers > 0 else 0
-    review_reduction_pct = 100 - high_risk_pct
-    
+    return {
+        'Total Customers': total_customers,
+        'High Risk Count': high_risk_count,
+        'High Risk %': high_risk_pct,
+        'Manual Review Reduction %': 100 - high_risk_pct
+    }
+
+def summarize_hybrid_report(hybrid_df):
+
+    metrics = hybrid_headline_metrics(hybrid_df)
+    total_customers = metrics['Total Customers']
+    high_risk_count = metrics['High Risk Count']
+    high_risk_pct = metrics['High Risk %']
+    review_reduction_pct = metrics['Manual Review Reduction %']
 
-    detailed_path = os.path.join(DATA_DIR, 'hybrid_customer_profiles.csv')
-    hybrid_df.to_csv(detailed_path, index=False)
-    
     summary_data = {
         'Metric': ['Total Customers', 'High Risk Count', 'High Risk %', 'Manual Review Reduction %'],
         'Value': [total_customers, high_risk_count, f"{high_risk_pct:.2f}%", f"{review_reduction_pct:.2f}%"]
     }
-    summary_df = pd.DataFrame(summary_data)
+    return pd.DataFrame(summary_data)
+
+def dashboard_kpis(credit_df, fraud_df, hybrid_df):
+
+    return pd.DataFrame({
+        'Metric': ['Total Customers', 'High Risk Credit Profiles', 'Flagged Fraud Events', 'Critical Anomalies',
+                   'Avg Hybrid Risk Score'],
+        'Value': [len(credit_df), (credit_df['risk_band'] == 'High Risk').sum(), (fraud_df['fraud_risk_score'] > 70).sum(),
+                  (fraud_df['fraud_risk_score'] > 75).sum(), hybrid_df['hybrid_risk_score'].mean()]
+    })
+
+@profile_runtime
+def generate_hybrid_report(incremental=False, state_path=HYBRID_STATE_PATH, review_capacity=DEFAULT_REVIEW_CAPACITY):
+    print("Generating Hybrid Risk Report...")
+
+    CREDIT_SCORES_PATH = os.path.join(DATA_DIR, 'credit_risk_scores.csv')
+    FRAUD_SCORES_PATH = os.path.join(DATA_DIR, 'fraud_risk_scores.csv')
+    detailed_path = os.path.join(DATA_DIR, 'hybrid_customer_profiles.csv')
+
+    credit_df = pd.read_csv(CREDIT_SCORES_PATH)
+    fraud_df = pd.read_csv(FRAUD_SCORES_PATH)
+
+    state = None
+    if incremental and os.path.exists(state_path) and os.path.exists(detailed_path):
+        state = load_customer_state(state_path)
+        if state is None or not state_extends(state, credit_df, fraud_df):
+            print("Saved customer state does not match the current scores; rebuilding all customers.")
+            state = None
+    if state is not None:
+        state, dirty = refresh_customer_state(state, credit_df, fraud_df)
+        changed = profiles_from_state(state, dirty)
+        hybrid_df = patch_profiles(pd.read_csv(detailed_path), state, dirty, changed)
+        print(f"Refreshed {len(dirty)} customers touched since the last run.")
+    else:
+        state = build_customer_state(credit_df, fraud_df)
+        hybrid_df = changed = profiles_from_state(state)
+
+    save_customer_state(state, state_path)
+    write_outputs(hybrid_df, detailed_path)
+    upsert_features(hybrid_customer_features(changed))
+
+    capacity_df = capacity_report(credit_df, fraud_df, hybrid_df, review_capacity)
+    capacity_df.to_csv(CAPACITY_PATH, index=False)
+
+    summary_df = pd.concat([summarize_hybrid_report(hybrid_df), capacity_summary(capacity_df)], ignore_index=True)
     summary_df.to_csv(os.path.join(DATA_DIR, 'hybrid_risk_report.csv'), index=False)
+    dashboard_kpis(credit_df, fraud_df, hybrid_df).to_csv(os.path.join(DATA_DIR, 'dashboard_kpis.csv'), index=False)
     print("Hybrid report generated.")
 
 if __name__ == "__main__":
-    generate_hybrid_report()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the hybrid customer profiles and risk report.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only recompute customers with rows added since the last run. Credit scores must be "
+                             "appended in row order and fraud scores in Time order; otherwise a full rebuild runs")
+    parser.add_argument('--review-capacity', type=int, default=DEFAULT_REVIEW_CAPACITY,
+                        help="Reviews per period used to solve the score cutoffs")
+    args = parser.parse_args()
+    generate_hybrid_report(args.incremental, review_capacity=args.review_capacity)
@@ -0,0 +1,20 @@
+
+import numpy as np
+
+
+BAND_LABELS = ['Low Risk', 'Medium Risk', 'High Risk']
+
+def load_rule_patterns(path):
+
+    with np.load(path) as data:
+        matrix = np.unpackbits(data['bits'], axis=0, count=int(data['rows'])).astype(bool)
+        published = {key: data[key] for key in ('names', 'reasons', 'weights', 'cutoffs')}
+    keys = matrix @ (np.int64(1) << np.arange(matrix.shape[1], dtype=np.int64))
+    _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    return dict(published, patterns=matrix[first].astype(float), counts=counts)
+
+def band_counts(patterns, counts, weights, high, medium):
+
+    scores = np.minimum(patterns @ np.asarray(weights, dtype=float), 100)
+    bands = np.searchsorted([medium, high], scores, side='right')
+    return np.bincount(bands, weights=counts, minlength=3).astype(np.int64)
@@ -1,48 +1,46 @@
 
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
 from hris.core.engine import compute_transaction_risk_score
+from hris.core.cube import TRANSACTION_CUBE_PATH, load_cube, build_transaction_cube, monthly_stats_from_cube
+from hris.research.evaluation import CURVE_PATH, FALSE_POSITIVE_COST, FALSE_NEGATIVE_COST, cutoff_curve, best_cutoff
+from hris.utils.rendering import submit_plot, render_line, wait_for_renders
 
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 PLOTS_DIR = os.path.join(BASE_DIR, 'plots')
 
-def run_backtesting():
+def run_backtesting(fp_cost=FALSE_POSITIVE_COST, fn_cost=FALSE_NEGATIVE_COST):
 
     print("Running Backtesting Simulation...")
+    FRAUD_SCORES_PATH = os.path.join(DATA_DIR, 'fraud_risk_scores.csv')
     
-    FRAUD_CLEAN_PATH = os.path.join(DATA_DIR, 'cleaned_transaction_data.csv')
-    df = pd.read_csv(FRAUD_CLEAN_PATH)
-    
-
-    scored_df = compute_transaction_risk_score(df)
-    
-    if 'datetime' not in scored_df.columns:
-         scored_df['datetime'] = pd.to_datetime(scored_df['Time'], unit='s', origin='2024-01-01')
-
-    scored_df['Month'] = scored_df['datetime'].dt.to_period('M')
-    
-    monthly_stats = scored_df.groupby('Month').agg({
-        'fraud_risk_score': ['mean', 'count'],
-        'risk_band': lambda x: (x == 'High Risk').sum()
-    }).reset_index()
-    
-    monthly_stats.columns = ['Month', 'Avg_Risk_Score', 'Total_Txns', 'High_Risk_Flags']
-    monthly_stats['Flag_Rate_Pct'] = (monthly_stats['High_Risk_Flags'] / monthly_stats['Total_Txns']) * 100
+    scored_df = None
+    cube = load_cube(TRANSACTION_CUBE_PATH)
+    if cube is None or not os.path.exists(FRAUD_SCORES_PATH):
+        FRAUD_CLEAN_PATH = os.path.join(DATA_DIR, 'cleaned_transaction_data.csv')
+        df = pd.read_csv(FRAUD_CLEAN_PATH)
+        scored_df = compute_transaction_risk_score(df)
+        cube = build_transaction_cube(scored_df)
+    else:
+        scored_df = pd.read_csv(FRAUD_SCORES_PATH, usecols=['fraud_risk_score', 'Class'])
+
+    monthly_stats = monthly_stats_from_cube(cube)
     
     monthly_stats.to_csv(os.path.join(DATA_DIR, 'backtest_summary.csv'), index=False)
+
+    curve = cutoff_curve(scored_df['fraud_risk_score'], scored_df['Class'], fp_cost, fn_cost)
+    curve.to_csv(CURVE_PATH, index=False)
+    best = best_cutoff(curve)
+    print(f"Lowest expected cost at cutoff {int(best['cutoff'])}: precision={best['precision']:.4f} "
+          f"recall={best['recall']:.4f} alerts={int(best['alerts']):,}")
     
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=monthly_stats, x=monthly_stats['Month'].astype(str), y='Flag_Rate_Pct', marker='o')
-    plt.title('Monthly High Risk Flag Rate')
-    plt.ylabel('Flag Rate (%)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(os.path.join(PLOTS_DIR, 'backtest_trend.png'))
+    submit_plot(render_line, os.path.join(PLOTS_DIR, 'backtest_trend.png'),
+                x=monthly_stats['Month'].astype(str).to_numpy(), y=monthly_stats['Flag_Rate_Pct'].to_numpy(),
+                title='Monthly High Risk Flag Rate', ylabel='Flag Rate (%)')
     print("Backtesting complete.")
 
 if __name__ == "__main__":
     run_backtesting()
+    wait_for_renders()
@@ -0,0 +1,52 @@
+
+import pandas as pd
+import numpy as np
+import os
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+CURVE_PATH = os.path.join(DATA_DIR, 'fraud_cutoff_curve.csv')
+
+FALSE_POSITIVE_COST = 1.0
+FALSE_NEGATIVE_COST = 25.0
+MAX_SCORE = 100
+
+def cutoff_curve(scores, labels, fp_cost=FALSE_POSITIVE_COST, fn_cost=FALSE_NEGATIVE_COST, max_score=MAX_SCORE):
+
+    scores = np.clip(np.asarray(scores, dtype=np.int64), 0, max_score)
+    labels = np.asarray(labels, dtype=np.float64)
+    counts = np.bincount(scores, minlength=max_score + 1)
+    frauds = np.bincount(scores, weights=labels, minlength=max_score + 1)
+
+    alerts = np.cumsum(counts[::-1])[::-1]
+    true_pos = np.cumsum(frauds[::-1])[::-1]
+    total = counts.sum()
+    total_fraud = frauds.sum()
+    false_pos = alerts - true_pos
+    false_neg = total_fraud - true_pos
+    true_neg = total - alerts - false_neg
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(alerts > 0, true_pos / alerts, np.nan)
+        recall = true_pos / total_fraud if total_fraud > 0 else np.full(len(alerts), np.nan)
+        base_rate = total_fraud / total if total > 0 else np.nan
+        lift = precision / base_rate
+
+    return pd.DataFrame({
+        'cutoff': np.arange(max_score + 1),
+        'alerts': alerts,
+        'alert_rate_pct': alerts / total * 100 if total > 0 else np.nan,
+        'true_positives': true_pos.astype(np.int64),
+        'false_positives': false_pos.astype(np.int64),
+        'false_negatives': false_neg.astype(np.int64),
+        'true_negatives': true_neg.astype(np.int64),
+        'precision': precision,
+        'recall': recall,
+        'lift': lift,
+        'expected_cost': false_pos * fp_cost + false_neg * fn_cost
+    })
+
+def best_cutoff(curve):
+
+    return curve.loc[curve['expected_cost'].idxmin()]
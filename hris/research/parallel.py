@@ -0,0 +1,92 @@
+
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+import pandas as pd
+from hris.research.sweep import WORKER_MEMORY_BUDGET, evaluate_configs
+
+
+_worker_arrays = {}
+_worker_blocks = []
+
+def publish_arrays(arrays):
+
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+def attach_arrays(specs):
+
+    arrays, blocks = {}, []
+    for name, (block_name, shape, dtype) in specs.items():
+        try:
+            block = shared_memory.SharedMemory(name=block_name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=block_name)
+            resource_tracker.unregister(block._name, 'shared_memory')
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+def release_arrays(blocks):
+
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+def _init_worker(specs):
+
+    arrays, blocks = attach_arrays(specs)
+    _worker_arrays.update(arrays)
+    _worker_blocks.extend(blocks)
+
+def _evaluate_slice(task):
+
+    start, weights, cutoffs, block_size, memory_budget = task
+    results = evaluate_configs(_worker_arrays['patterns'], _worker_arrays.get('counts'), _worker_arrays['frauds'],
+                               weights, cutoffs, block_size, buckets=_worker_arrays.get('buckets'),
+                               memory_budget=memory_budget)
+    results['config_id'] += start
+    return results
+
+def config_slices(n_configs, workers, slices_per_worker=4):
+
+    n_slices = max(1, min(n_configs, workers * slices_per_worker))
+    bounds = np.linspace(0, n_configs, n_slices + 1).astype(int)
+    return [(bounds[i], bounds[i + 1]) for i in range(n_slices) if bounds[i] < bounds[i + 1]]
+
+def csv_sink(path):
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    def write(results):
+        results.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+    return write
+
+def run_parallel_sweep(arrays, weights, cutoffs, workers=None, sink=None, block_size=1024,
+                       memory_budget=WORKER_MEMORY_BUDGET):
+
+    workers = workers or os.cpu_count()
+    blocks, specs = publish_arrays(arrays)
+    collected = []
+    sink = sink or collected.append
+    try:
+        ctx = mp.get_context('spawn')
+        tasks = [(start, weights[start:stop], cutoffs[start:stop], block_size, memory_budget)
+                 for start, stop in config_slices(len(weights), workers)]
+        with ctx.Pool(workers, initializer=_init_worker, initargs=(specs,)) as pool:
+            for results in pool.imap(_evaluate_slice, tasks):
+                sink(results)
+    finally:
+        release_arrays(blocks)
+    print(f"Evaluated {len(weights):,} configurations across {workers} workers.")
+    if collected:
+        return pd.concat(collected, ignore_index=True)
+    return None
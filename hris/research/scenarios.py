@@ -0,0 +1,118 @@
+
+import argparse
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import pandas as pd
+import numpy as np
+from hris.core.cleaning import load_data, prepare_credit_data, prepare_fraud_data, simulate_credit_fields, simulate_fraud_fields
+from hris.core.engine import compute_credit_risk_score, compute_transaction_risk_score
+from hris.reporting.dashboard_prep import build_hybrid_profiles, hybrid_headline_metrics
+from hris.research.parallel import attach_arrays, publish_arrays, release_arrays
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+SCENARIO_RUNS_PATH = os.path.join(DATA_DIR, 'scenario_runs.csv')
+SCENARIO_INTERVALS_PATH = os.path.join(DATA_DIR, 'scenario_intervals.csv')
+
+_worker_frames = {}
+_worker_blocks = []
+
+def frame_arrays(frames):
+
+    arrays = {}
+    for name, df in frames.items():
+        for column in df.columns:
+            values = df[column].to_numpy()
+            if values.dtype.kind not in 'biuf':
+                raise ValueError(f"Column {name}.{column} is not numeric and cannot be shared between workers.")
+            arrays[f"{name}::{column}"] = values
+    return arrays
+
+def arrays_frames(arrays):
+
+    columns = {}
+    for key, values in arrays.items():
+        name, column = key.split('::', 1)
+        columns.setdefault(name, {})[column] = values
+    return {name: pd.DataFrame(data, copy=False) for name, data in columns.items()}
+
+def _init_worker(specs):
+
+    arrays, blocks = attach_arrays(specs)
+    _worker_frames.update(arrays_frames(arrays))
+    _worker_blocks.extend(blocks)
+
+def scenario_metrics(credit_scored, fraud_scored, hybrid_df):
+
+    metrics = {k: float(v) for k, v in hybrid_headline_metrics(hybrid_df).items()}
+    metrics['Credit High Risk %'] = (credit_scored['risk_band'] == 'High Risk').mean() * 100
+    flags = fraud_scored['risk_band'] == 'High Risk'
+    metrics['Fraud Flag Rate %'] = flags.mean() * 100
+    if 'Class' in fraud_scored.columns:
+        fraud = fraud_scored['Class'] == 1
+        true_pos = (flags & fraud).sum()
+        metrics['Fraud Precision'] = true_pos / flags.sum() if flags.sum() else np.nan
+        metrics['Fraud Recall'] = true_pos / fraud.sum() if fraud.sum() else np.nan
+    return metrics
+
+def run_scenario(seed, credit_base=None, fraud_base=None):
+
+    credit_base = _worker_frames['credit'] if credit_base is None else credit_base
+    fraud_base = _worker_frames['fraud'] if fraud_base is None else fraud_base
+    with contextlib.redirect_stdout(io.StringIO()):
+        credit_scored = compute_credit_risk_score(simulate_credit_fields(credit_base.copy(), seed))
+        fraud_scored = compute_transaction_risk_score(simulate_fraud_fields(fraud_base.copy(), seed))
+        hybrid_df = build_hybrid_profiles(credit_scored, fraud_scored, seed=seed)
+    return {'seed': seed, **scenario_metrics(credit_scored, fraud_scored, hybrid_df)}
+
+def confidence_intervals(runs, level=0.95):
+
+    tail = (1 - level) / 2 * 100
+    metrics = runs.drop(columns='seed')
+    return pd.DataFrame({
+        'Metric': metrics.columns,
+        'Runs': metrics.count().to_numpy(),
+        'Mean': metrics.mean().to_numpy(),
+        'Std': metrics.std().to_numpy(),
+        'CI_Low': np.nanpercentile(metrics.to_numpy(), tail, axis=0),
+        'CI_High': np.nanpercentile(metrics.to_numpy(), 100 - tail, axis=0)
+    })
+
+def run_scenarios(n_seeds=100, workers=None, start_seed=0, runs_path=SCENARIO_RUNS_PATH,
+                  intervals_path=SCENARIO_INTERVALS_PATH):
+
+    print(f"Running {n_seeds} Monte Carlo scenarios...")
+    credit_base = prepare_credit_data(load_data(os.path.join(DATA_DIR, 'credit_risk_train.csv')))
+    fraud_base = prepare_fraud_data(load_data(os.path.join(DATA_DIR, 'creditcard.csv')))
+    seeds = range(start_seed, start_seed + n_seeds)
+    workers = min(workers or os.cpu_count(), n_seeds)
+
+    if workers > 1:
+        blocks, specs = publish_arrays(frame_arrays({'credit': credit_base, 'fraud': fraud_base}))
+        try:
+            ctx = mp.get_context('spawn')
+            with ctx.Pool(workers, initializer=_init_worker, initargs=(specs,)) as pool:
+                rows = list(pool.imap_unordered(run_scenario, seeds))
+        finally:
+            release_arrays(blocks)
+    else:
+        rows = [run_scenario(seed, credit_base, fraud_base) for seed in seeds]
+
+    runs = pd.DataFrame(rows).sort_values('seed', ignore_index=True)
+    runs.to_csv(runs_path, index=False)
+    intervals = confidence_intervals(runs)
+    intervals.to_csv(intervals_path, index=False)
+    print(intervals.to_string(index=False))
+    print(f"Scenario intervals saved to {intervals_path}")
+    return intervals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run clean, score and report under different synthetic seeds.")
+    parser.add_argument('--seeds', type=int, default=100, help="Number of seeds to simulate")
+    parser.add_argument('--start-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help="Worker processes (defaults to the CPU count)")
+    args = parser.parse_args()
+    run_scenarios(args.seeds, args.workers, args.start_seed)
@@ -0,0 +1,172 @@
+
+import argparse
+import itertools
+import pandas as pd
+import numpy as np
+import os
+from hris.core.engine import FRAUD_RULES, HIGH_RISK_CUTOFF, add_velocity_features, fit_fraud_thresholds, fraud_rule_hits, rule_hit_matrix
+from hris.utils.profiling import profile_runtime
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+SWEEP_PATH = os.path.join(DATA_DIR, 'backtest_sweep.csv')
+
+RULE_NAMES = [name for name, _, _ in FRAUD_RULES]
+PRODUCTION_WEIGHTS = np.array([weight for _, weight, _ in FRAUD_RULES], dtype=float)
+WORKER_MEMORY_BUDGET = 256 << 20
+BYTES_PER_CELL = 4 + 1 + 8
+
+def compute_fraud_hits(df):
+
+    df = add_velocity_features(df)
+    hits = rule_hit_matrix(fraud_rule_hits(df, fit_fraud_thresholds(df)), FRAUD_RULES)
+    return df, hits
+
+def compress_hits(hits, labels, buckets=None):
+
+    keys = np.packbits(hits, axis=1, bitorder='little')
+    keys = keys.view(np.dtype((np.void, keys.shape[1]))).ravel()
+    if buckets is not None:
+        combined = np.empty(len(keys), dtype=[('bucket', np.int64), ('key', keys.dtype)])
+        combined['bucket'] = buckets
+        combined['key'] = keys
+        keys = combined
+    unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    patterns = hits[first]
+    counts = np.bincount(inverse, minlength=len(unique_keys))
+    frauds = np.bincount(inverse, weights=labels, minlength=len(unique_keys))
+    if buckets is None:
+        return patterns, counts, frauds
+    return patterns, counts, frauds, np.asarray(buckets)[first]
+
+def grid_configs(weight_multipliers=(0.5, 1.0, 1.5), thresholds=(60, 70, 80), base_weights=PRODUCTION_WEIGHTS):
+
+    combos = np.array(list(itertools.product(weight_multipliers, repeat=len(base_weights))))
+    weights = np.repeat(combos * base_weights, len(thresholds), axis=0)
+    cutoffs = np.tile(np.asarray(thresholds, dtype=float), len(combos))
+    return weights, cutoffs
+
+def random_configs(n_configs, seed=42, max_weight=50, thresholds=(40, 90), n_rules=len(RULE_NAMES)):
+
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(0, max_weight + 1, size=(n_configs, n_rules)).astype(float)
+    cutoffs = rng.integers(thresholds[0], thresholds[1] + 1, size=n_configs).astype(float)
+    return weights, cutoffs
+
+def _bucket_starts(bucket_index):
+
+    return np.concatenate(([0], np.flatnonzero(np.diff(bucket_index)) + 1))
+
+def block_shape(n_rows, n_configs, block_size=1024, memory_budget=WORKER_MEMORY_BUDGET):
+
+    block_size = max(1, min(block_size, n_configs))
+    row_block = max(1, min(n_rows, memory_budget // (BYTES_PER_CELL * block_size)))
+    return row_block, block_size
+
+def evaluate_configs(patterns, counts, frauds, weights, cutoffs, block_size=1024, buckets=None, row_block=None,
+                     memory_budget=WORKER_MEMORY_BUDGET):
+
+    n_rows = len(patterns)
+    if row_block is None:
+        row_block, block_size = block_shape(n_rows, len(weights), block_size, memory_budget)
+    counts = np.ones(n_rows) if counts is None else np.asarray(counts, dtype=np.float64)
+    frauds = np.asarray(frauds, dtype=np.float64)
+    total = counts.sum()
+    total_fraud = frauds.sum()
+
+    if buckets is not None:
+        bucket_ids, bucket_index = np.unique(buckets, return_inverse=True)
+        if np.any(np.diff(bucket_index) < 0):
+            raise ValueError("Rows must be ordered by bucket.")
+        bucket_totals = np.bincount(bucket_index, weights=counts, minlength=len(bucket_ids))
+        bucket_flagged = np.zeros((len(weights), len(bucket_ids)))
+
+    flagged = np.zeros(len(weights))
+    true_pos = np.zeros(len(weights))
+    for r0 in range(0, n_rows, row_block):
+        r1 = min(r0 + row_block, n_rows)
+        block_patterns = np.asarray(patterns[r0:r1], dtype=np.float32)
+        block_counts = counts[r0:r1]
+        if buckets is not None:
+            starts = _bucket_starts(bucket_index[r0:r1])
+            start_buckets = bucket_index[r0:r1][starts]
+        for start in range(0, len(weights), block_size):
+            stop = min(start + block_size, len(weights))
+            scores = np.minimum(block_patterns @ weights[start:stop].T.astype(np.float32), 100)
+            flags = scores >= cutoffs[start:stop]
+            flagged[start:stop] += block_counts @ flags
+            true_pos[start:stop] += frauds[r0:r1] @ flags
+            if buckets is not None:
+                per_bucket = np.add.reduceat(flags * block_counts[:, None], starts, axis=0)
+                np.add.at(bucket_flagged[start:stop].T, start_buckets, per_bucket)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(flagged > 0, true_pos / flagged, np.nan)
+        recall = true_pos / total_fraud if total_fraud > 0 else np.full(len(weights), np.nan)
+    results = pd.DataFrame(weights, columns=[f"w_{name}" for name in RULE_NAMES[:weights.shape[1]]])
+    results.insert(0, 'config_id', np.arange(len(weights)))
+    results['cutoff'] = cutoffs
+    results['flagged'] = flagged.astype(np.int64)
+    results['true_positives'] = true_pos.astype(np.int64)
+    results['precision'] = precision
+    results['recall'] = recall
+    results['flag_rate_pct'] = flagged / total * 100 if total > 0 else np.nan
+    if buckets is not None:
+        bucket_rates = bucket_flagged / bucket_totals * 100
+        results['max_bucket_flag_rate_pct'] = bucket_rates.max(axis=1)
+        results['bucket_flag_rate_std'] = bucket_rates.std(axis=1)
+    return results
+
+@profile_runtime
+def run_sweep(weights=None, cutoffs=None, block_size=1024, workers=1, bucket_seconds=3600, output_path=SWEEP_PATH):
+
+    print("Running Rule Weight Sweep...")
+    FRAUD_CLEAN_PATH = os.path.join(DATA_DIR, 'cleaned_transaction_data.csv')
+    df = pd.read_csv(FRAUD_CLEAN_PATH)
+    df, hits = compute_fraud_hits(df)
+    order = np.argsort(df['Time'].to_numpy(), kind='stable')
+    hits = hits[order]
+    labels = df['Class'].to_numpy()[order]
+    buckets = (df['Time'].to_numpy()[order] // bucket_seconds).astype(np.int64)
+
+    if weights is None:
+        weights, cutoffs = grid_configs()
+
+    patterns, counts, frauds, pattern_buckets = compress_hits(hits, labels, buckets)
+    print(f"{len(df):,} transactions collapse to {len(patterns)} distinct bucketed rule-hit patterns.")
+    if workers > 1:
+        from hris.research.parallel import run_parallel_sweep, csv_sink
+        sink = csv_sink(output_path)
+        run_parallel_sweep({'patterns': patterns, 'counts': counts, 'frauds': frauds, 'buckets': pattern_buckets},
+                           weights, cutoffs, workers=workers, sink=sink, block_size=block_size)
+        results = pd.read_csv(output_path)
+    else:
+        results = evaluate_configs(patterns, counts, frauds, weights, cutoffs, block_size, buckets=pattern_buckets)
+        results.to_csv(output_path, index=False)
+
+    patterns, counts, frauds = compress_hits(hits, labels)
+    production = evaluate_configs(patterns, counts, frauds, PRODUCTION_WEIGHTS[None, :],
+                                  np.array([HIGH_RISK_CUTOFF], dtype=float))
+    print(f"Production rules: precision={production['precision'].iloc[0]:.4f} "
+          f"recall={production['recall'].iloc[0]:.4f} flag_rate={production['flag_rate_pct'].iloc[0]:.3f}%")
+    print(f"Sweep of {len(results):,} configurations saved to {output_path}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep fraud rule weights and cutoffs over precomputed rule hits.")
+    parser.add_argument('--random', type=int, help="Evaluate N random configurations instead of the multiplier grid")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--multipliers', type=lambda v: [float(x) for x in v.split(',')], default=[0.5, 1.0, 1.5])
+    parser.add_argument('--cutoffs', type=lambda v: [float(x) for x in v.split(',')], default=[60, 70, 80])
+    parser.add_argument('--block-size', type=int, default=1024)
+    parser.add_argument('--bucket-seconds', type=int, default=3600, help="Time bucket for per-bucket flag rates")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Evaluate configuration slices in N processes over shared-memory rule hits")
+    args = parser.parse_args()
+
+    if args.random:
+        weights, cutoffs = random_configs(args.random, args.seed)
+    else:
+        weights, cutoffs = grid_configs(args.multipliers, args.cutoffs)
+    run_sweep(weights, cutoffs, args.block_size, args.workers, args.bucket_seconds)
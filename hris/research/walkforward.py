@@ -0,0 +1,143 @@
+
+import argparse
+import pandas as pd
+import numpy as np
+import os
+from hris.core.engine import FRAUD_RULES, HIGH_RISK_CUTOFF, add_velocity_features, fit_fraud_thresholds, fraud_rule_hits
+from hris.utils.profiling import profile_runtime
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+WALKFORWARD_PATH = os.path.join(DATA_DIR, 'walkforward_summary.csv')
+
+THRESHOLD_RULES = {
+    'extreme_price_shock': ('Amount', 'amount_99'),
+    'high_value': ('Amount', 'amount_95'),
+    'extreme_value': ('Amount', 'amount_99'),
+    'burst_activity': ('txn_count_5min', 'burst'),
+    'high_velocity': ('txn_count_1h', 'velocity')
+}
+
+class RollingQuantiles:
+
+    def __init__(self, values):
+        self.levels, self.codes = np.unique(values, return_inverse=True)
+        self.tree = np.zeros(len(self.levels) + 1, dtype=np.int64)
+        self.step = 1 << (len(self.levels).bit_length() - 1) if len(self.levels) else 0
+        self.n = 0
+
+    def _update(self, start, stop, delta):
+        index = self.codes[start:stop] + 1
+        while len(index):
+            np.add.at(self.tree, index, delta)
+            index = index + (index & -index)
+            index = index[index < len(self.tree)]
+
+    def _level(self, rank):
+        position, remaining, step = 0, rank + 1, self.step
+        while step:
+            if position + step < len(self.tree) and self.tree[position + step] < remaining:
+                position += step
+                remaining -= self.tree[position]
+            step >>= 1
+        return self.levels[position]
+
+    def add(self, start, stop):
+        self._update(start, stop, 1)
+        self.n += stop - start
+
+    def remove(self, start, stop):
+        self._update(start, stop, -1)
+        self.n -= stop - start
+
+    def quantile(self, q):
+        if self.n == 0:
+            return np.nan
+        position = (self.n - 1) * q
+        lower = int(np.floor(position))
+        upper = min(lower + 1, self.n - 1)
+        lo_value = self._level(lower)
+        hi_value = self._level(upper)
+        return lo_value + (hi_value - lo_value) * (position - lower)
+
+@profile_runtime
+def walk_forward(df, bucket_seconds=3600, train_buckets=24, test_buckets=1):
+
+    df = add_velocity_features(df)
+    df = df.sort_values('Time', kind='stable').reset_index(drop=True)
+    buckets = (df['Time'].to_numpy() // bucket_seconds).astype(np.int64)
+    first, last = buckets[0], buckets[-1]
+    bounds = np.searchsorted(buckets, np.arange(first, last + 2))
+
+    hits = fraud_rule_hits(df, fit_fraud_thresholds(df))
+    fixed_score = np.zeros(len(df))
+    for name, weight, _ in FRAUD_RULES:
+        if name not in THRESHOLD_RULES:
+            fixed_score += weight * np.asarray(hits[name], dtype=float)
+
+    columns = {col for col, _ in THRESHOLD_RULES.values()}
+    windows = {col: RollingQuantiles(df[col].to_numpy()) for col in columns}
+    values = {col: df[col].to_numpy() for col in columns}
+    labels = df['Class'].to_numpy()
+
+    def bucket_rows(b):
+        return bounds[b - first], bounds[b - first + 1]
+
+    for b in range(first, min(first + train_buckets, last + 1)):
+        for window in windows.values():
+            window.add(*bucket_rows(b))
+
+    rows = []
+    for test_start in range(first + train_buckets, last + 1, test_buckets):
+        thresholds = fit_fraud_thresholds(None, quantile=lambda col, q: windows[col].quantile(q))
+        start = bucket_rows(test_start)[0]
+        stop = bucket_rows(min(test_start + test_buckets, last + 1) - 1)[1]
+
+        score = fixed_score[start:stop].copy()
+        for name, weight, _ in FRAUD_RULES:
+            if name in THRESHOLD_RULES:
+                col, key = THRESHOLD_RULES[name]
+                score += weight * (values[col][start:stop] > thresholds[key])
+        flags = np.minimum(score, 100) >= HIGH_RISK_CUTOFF
+        fraud = labels[start:stop] == 1
+
+        n_flagged = int(flags.sum())
+        true_pos = int((flags & fraud).sum())
+        rows.append(dict(
+            train_start=(test_start - train_buckets) * bucket_seconds,
+            test_start=test_start * bucket_seconds,
+            test_end=(test_start + test_buckets) * bucket_seconds,
+            **{f"thresh_{k}": v for k, v in thresholds.items()},
+            txns=stop - start,
+            flagged=n_flagged,
+            flag_rate_pct=n_flagged / (stop - start) * 100 if stop > start else np.nan,
+            true_positives=true_pos,
+            precision=true_pos / n_flagged if n_flagged else np.nan,
+            recall=true_pos / fraud.sum() if fraud.sum() else np.nan
+        ))
+
+        for b in range(test_start, min(test_start + test_buckets, last + 1)):
+            for window in windows.values():
+                window.add(*bucket_rows(b))
+                window.remove(*bucket_rows(b - train_buckets))
+
+    return pd.DataFrame(rows)
+
+def run_walk_forward(bucket_seconds=3600, train_buckets=24, test_buckets=1, output_path=WALKFORWARD_PATH):
+
+    print("Running Walk-Forward Backtest...")
+    FRAUD_CLEAN_PATH = os.path.join(DATA_DIR, 'cleaned_transaction_data.csv')
+    df = pd.read_csv(FRAUD_CLEAN_PATH)
+    summary = walk_forward(df, bucket_seconds, train_buckets, test_buckets)
+    summary.to_csv(output_path, index=False)
+    print(f"{len(summary)} walk-forward steps saved to {output_path}")
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward fraud backtest with trailing-window recalibration.")
+    parser.add_argument('--bucket-seconds', type=int, default=3600, help="Length of one time bucket (86400 for daily)")
+    parser.add_argument('--train-buckets', type=int, default=24, help="Trailing buckets used to fit thresholds")
+    parser.add_argument('--test-buckets', type=int, default=1, help="Buckets scored per step")
+    args = parser.parse_args()
+    run_walk_forward(args.bucket_seconds, args.train_buckets, args.test_buckets)
@@ -0,0 +1,252 @@
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+BENCH_DIR = os.path.join(BASE_DIR, 'benchmarks')
+HISTORY_PATH = os.path.join(BENCH_DIR, 'history.jsonl')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+DEFAULT_SCALES = [10_000, 100_000, 1_000_000, 10_000_000]
+STAGES = ['clean_credit', 'clean_fraud', 'score_credit', 'score_fraud', 'backtest_aggregate', 'hybrid_report']
+
+def make_credit_raw(n, seed=0):
+
+    rng = np.random.default_rng(seed)
+    income = rng.lognormal(8.6, 0.6, size=n).round()
+    income[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame({
+        'SeriousDlqin2yrs': (rng.random(n) < 0.067).astype(int),
+        'RevolvingUtilizationOfUnsecuredLines': rng.random(n),
+        'age': rng.integers(18, 95, size=n),
+        'NumberOfTime30-59DaysPastDueNotWorse': rng.poisson(0.4, size=n),
+        'DebtRatio': rng.lognormal(-1.0, 1.5, size=n),
+        'MonthlyIncome': income,
+        'NumberOfOpenCreditLinesAndLoans': rng.poisson(8, size=n),
+        'NumberOfTimes90DaysLate': rng.poisson(0.25, size=n),
+        'NumberRealEstateLoansOrLines': rng.poisson(1, size=n),
+        'NumberOfTime60-89DaysPastDueNotWorse': rng.poisson(0.2, size=n),
+        'NumberOfDependents': np.where(rng.random(n) < 0.03, np.nan, rng.poisson(0.8, size=n))
+    })
+
+def make_fraud_raw(n, seed=0):
+
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Time': np.sort(rng.integers(0, 172800, size=n)).astype(float),
+        'Amount': rng.lognormal(3.2, 1.6, size=n).round(2),
+        'Class': (rng.random(n) < 0.0017).astype(int)
+    })
+
+def _stage_inputs(n):
+
+    from hris.core.cleaning import clean_credit_data, clean_fraud_data
+    from hris.core.engine import compute_credit_risk_score, compute_transaction_risk_score
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        credit_raw = make_credit_raw(n)
+        fraud_raw = make_fraud_raw(n)
+        credit_clean = clean_credit_data(credit_raw.copy())
+        fraud_clean = clean_fraud_data(fraud_raw.copy())
+        credit_scored = compute_credit_risk_score(credit_clean.copy())
+        fraud_scored = compute_transaction_risk_score(fraud_clean.copy())
+    return {
+        'clean_credit': credit_raw,
+        'clean_fraud': fraud_raw,
+        'score_credit': credit_clean,
+        'score_fraud': fraud_clean,
+        'backtest_aggregate': fraud_scored,
+        'hybrid_report': (credit_scored, fraud_scored)
+    }
+
+def _stage_callable(stage, payload):
+
+    from hris.core.cleaning import clean_credit_data, clean_fraud_data
+    from hris.core.engine import compute_credit_risk_score, compute_transaction_risk_score
+    from hris.core.cube import build_transaction_cube, monthly_stats_from_cube
+    from hris.reporting.dashboard_prep import build_hybrid_profiles
+
+    if stage == 'hybrid_report':
+        credit_scored, fraud_scored = payload
+        return lambda: build_hybrid_profiles(credit_scored.copy(), fraud_scored)
+    if stage == 'backtest_aggregate':
+        return lambda: monthly_stats_from_cube(build_transaction_cube(payload))
+    func = {
+        'clean_credit': clean_credit_data,
+        'clean_fraud': clean_fraud_data,
+        'score_credit': compute_credit_risk_score,
+        'score_fraud': compute_transaction_risk_score
+    }[stage]
+    return lambda: func(payload.copy())
+
+def time_stage(stage, payload, repeats=5, warmup=1):
+
+    run = _stage_callable(stage, payload)
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            run()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return timings, peak
+
+def _git_commit():
+
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(scales=None, stages=None, repeats=5, warmup=1, history_path=HISTORY_PATH):
+
+    scales = scales or DEFAULT_SCALES
+    stages = stages or STAGES
+    run_id = datetime.datetime.now().strftime('%Y%m%dT%H%M%S')
+    meta = {
+        'run_id': run_id,
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__
+    }
+    records = []
+    for n in scales:
+        inputs = _stage_inputs(n)
+        for stage in stages:
+            timings, peak = time_stage(stage, inputs[stage], repeats=repeats, warmup=warmup)
+            median = statistics.median(timings)
+            record = dict(meta, stage=stage, rows=n, repeats=repeats, warmup=warmup,
+                          min_s=min(timings), median_s=median, mean_s=statistics.fmean(timings),
+                          throughput_rows_s=n / median if median > 0 else None,
+                          peak_mem_mb=peak / 2**20)
+            records.append(record)
+            print(f"[{stage}] rows={n:,} median={median:.4f}s "
+                  f"throughput={record['throughput_rows_s']:,.0f} rows/s peak={record['peak_mem_mb']:.1f} MB")
+
+    os.makedirs(os.path.dirname(history_path), exist_ok=True)
+    with open(history_path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    print(f"Benchmark run {run_id} appended to {history_path}")
+    return records
+
+def load_history(history_path=HISTORY_PATH):
+
+    if not os.path.exists(history_path):
+        return []
+    with open(history_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def latest_run(history_path=HISTORY_PATH):
+
+    history = load_history(history_path)
+    if not history:
+        return []
+    run_id = history[-1]['run_id']
+    return [r for r in history if r['run_id'] == run_id]
+
+def save_baseline(records, baseline_path=BASELINE_PATH):
+
+    with open(baseline_path, 'w') as f:
+        json.dump(records, f, indent=2)
+    print(f"Baseline of {len(records)} records saved to {baseline_path}")
+
+def compare_to_baseline(records, baseline_path=BASELINE_PATH, time_tolerance=0.10, mem_tolerance=0.10):
+
+    with open(baseline_path) as f:
+        baseline = {(r['stage'], r['rows']): r for r in json.load(f)}
+
+    rows = []
+    for r in records:
+        base = baseline.get((r['stage'], r['rows']))
+        if base is None:
+            continue
+        time_ratio = r['median_s'] / base['median_s'] if base['median_s'] > 0 else float('inf')
+        mem_ratio = r['peak_mem_mb'] / base['peak_mem_mb'] if base['peak_mem_mb'] > 0 else float('inf')
+        rows.append({
+            'stage': r['stage'],
+            'rows': r['rows'],
+            'baseline_s': base['median_s'],
+            'current_s': r['median_s'],
+            'time_ratio': time_ratio,
+            'baseline_mb': base['peak_mem_mb'],
+            'current_mb': r['peak_mem_mb'],
+            'mem_ratio': mem_ratio,
+            'regression': time_ratio > 1 + time_tolerance or mem_ratio > 1 + mem_tolerance
+        })
+    return pd.DataFrame(rows)
+
+def _parse_scales(value):
+
+    return [int(float(v.lower().replace('k', 'e3').replace('m', 'e6'))) for v in value.split(',')]
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="HRIS pipeline stage benchmarks")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_p = sub.add_parser('run', help="Time every stage and append results to the history file")
+    run_p.add_argument('--scales', type=_parse_scales, default=DEFAULT_SCALES,
+                       help="Comma separated row counts, e.g. 10k,100k,1m,10m")
+    run_p.add_argument('--stages', type=lambda v: v.split(','), default=STAGES)
+    run_p.add_argument('--repeats', type=int, default=5)
+    run_p.add_argument('--warmup', type=int, default=1)
+    run_p.add_argument('--history', default=HISTORY_PATH)
+
+    base_p = sub.add_parser('baseline', help="Store the latest run as the regression baseline")
+    base_p.add_argument('--history', default=HISTORY_PATH)
+    base_p.add_argument('--baseline', default=BASELINE_PATH)
+
+    cmp_p = sub.add_parser('compare', help="Compare the latest run against the stored baseline")
+    cmp_p.add_argument('--history', default=HISTORY_PATH)
+    cmp_p.add_argument('--baseline', default=BASELINE_PATH)
+    cmp_p.add_argument('--time-tolerance', type=float, default=0.10)
+    cmp_p.add_argument('--mem-tolerance', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        run_benchmarks(args.scales, args.stages, args.repeats, args.warmup, args.history)
+        return 0
+    if args.command == 'baseline':
+        save_baseline(latest_run(args.history), args.baseline)
+        return 0
+
+    report = compare_to_baseline(latest_run(args.history), args.baseline,
+                                 args.time_tolerance, args.mem_tolerance)
+    if report.empty:
+        print("No overlapping stages between the latest run and the baseline.")
+        return 0
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    regressions = report[report['regression']]
+    if not regressions.empty:
+        print(f"{len(regressions)} regression(s) detected.")
+        return 1
+    print("No regressions detected.")
+    return 0
+
+if __name__ == "__main__":
+    sys.path.append(BASE_DIR)
+    sys.exit(main())
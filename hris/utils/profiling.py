@@ -1,13 +1,140 @@
 
+import cProfile
+import collections
+import os
+import pstats
+import sys
+import threading
 import time
 from functools import wraps
 
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+
+_profile_targets = set()
+_profile_options = {'mode': 'sample', 'interval': 0.005, 'top': 25, 'out_dir': PROFILE_DIR}
+_profile_active = threading.local()
+
+def enable_profiling(targets, mode='sample', interval=0.005, top=25, out_dir=PROFILE_DIR):
+
+    if mode not in ('sample', 'cprofile'):
+        raise ValueError(f"Unknown profile mode: {mode}. Use 'sample' or 'cprofile'.")
+    _profile_targets.clear()
+    _profile_targets.update(targets)
+    _profile_options.update(mode=mode, interval=interval, top=top, out_dir=out_dir)
+
+def is_profiled(name):
+
+    return name in _profile_targets or 'all' in _profile_targets
+
+def _frame_label(code):
+
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class _StackSampler(threading.Thread):
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def _write_sampled(name, stacks, out_dir, top):
+
+    collapsed_path = os.path.join(out_dir, f"{name}.collapsed")
+    with open(collapsed_path, 'w') as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    self_counts = collections.Counter()
+    total_counts = collections.Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+    n_samples = sum(stacks.values()) or 1
+
+    lines = [f"{'self%':>7} {'total%':>7} {'samples':>8}  function"]
+    for frame, count in self_counts.most_common(top):
+        lines.append(f"{100 * count / n_samples:7.2f} {100 * total_counts[frame] / n_samples:7.2f} {count:8d}  {frame}")
+    return collapsed_path, lines
+
+def _write_cprofile(name, profiler, out_dir, top):
+
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(os.path.join(out_dir, f"{name}.pstats"))
+
+    pairs_path = os.path.join(out_dir, f"{name}.callers")
+    with open(pairs_path, 'w') as f:
+        f.write("# caller;callee self-time-us pairs from cProfile, not full stacks\n")
+        for func, (_, _, tottime, _, callers) in stats.stats.items():
+            label = f"{func[2]} ({os.path.basename(func[0])}:{func[1]})"
+            if not callers:
+                f.write(f"{label} {int(tottime * 1e6)}\n")
+            for caller, caller_stats in callers.items():
+                caller_label = f"{caller[2]} ({os.path.basename(caller[0])}:{caller[1]})"
+                f.write(f"{caller_label};{label} {int(caller_stats[2] * 1e6)}\n")
+
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+    lines = [f"{'tottime':>9} {'cumtime':>9} {'ncalls':>9}  function"]
+    for func, (_, ncalls, tottime, cumtime, _) in rows:
+        lines.append(f"{tottime:9.4f} {cumtime:9.4f} {ncalls:9d}  {func[2]} ({os.path.basename(func[0])}:{func[1]})")
+    return pairs_path, lines
+
+def profile_call(name, func, *args, **kwargs):
+
+    if not is_profiled(name) or getattr(_profile_active, 'name', None):
+        return func(*args, **kwargs)
+
+    out_dir = _profile_options['out_dir']
+    os.makedirs(out_dir, exist_ok=True)
+    _profile_active.name = name
+    try:
+        if _profile_options['mode'] == 'cprofile':
+            profiler = cProfile.Profile()
+            result = profiler.runcall(func, *args, **kwargs)
+            profile_path, lines = _write_cprofile(name, profiler, out_dir, _profile_options['top'])
+        else:
+            sampler = _StackSampler(threading.get_ident(), _profile_options['interval'])
+            sampler.start()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                sampler.stop()
+            profile_path, lines = _write_sampled(name, sampler.stacks, out_dir, _profile_options['top'])
+    finally:
+        _profile_active.name = None
+
+    summary_path = os.path.join(out_dir, f"{name}_top.txt")
+    with open(summary_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    print(f"[{name}] Profile ({_profile_options['mode']}) written to {profile_path}")
+    print('\n'.join(lines))
+    return result
+
 def profile_runtime(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.time()
-        result = func(*args, **kwargs)
+        result = profile_call(func.__name__, func, *args, **kwargs)
         end_time = time.time()
         print(f"[{func.__name__}] Execution Time: {end_time - start_time:.4f} seconds")
         return result
@@ -0,0 +1,116 @@
+
+import os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+
+RENDER_WORKERS = int(os.environ.get('HRIS_RENDER_WORKERS', 2))
+
+_pool = None
+_pending = []
+
+def _init_worker():
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _figure(path, figsize):
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return plt, plt.figure(figsize=figsize)
+
+def render_histogram(path, counts, edges, title, kde=None):
+
+    plt, _ = _figure(path, (10, 6))
+    plt.stairs(counts, edges, fill=True, alpha=0.6)
+    if kde is not None:
+        plt.plot((edges[:-1] + edges[1:]) / 2, kde)
+    plt.title(title)
+    plt.savefig(path)
+    plt.close()
+
+def render_heatmap(path, matrix, labels, title):
+
+    import seaborn as sns
+    plt, _ = _figure(path, (12, 10))
+    sns.heatmap(matrix, xticklabels=labels, yticklabels=labels, annot=True, cmap='coolwarm', fmt=".2f")
+    plt.title(title)
+    plt.savefig(path)
+    plt.close()
+
+def render_density_grid(path, counts, x_edges, y_edges, title, xlabel, ylabel):
+
+    from matplotlib.colors import LogNorm
+    plt, _ = _figure(path, (10, 6))
+    plt.pcolormesh(x_edges, y_edges, counts.T, cmap='Blues', norm=LogNorm(vmin=1))
+    plt.colorbar(label='Transactions')
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.savefig(path)
+    plt.close()
+
+def render_category_counts(path, counts, category, hue, title):
+
+    import seaborn as sns
+    plt, _ = _figure(path, (10, 6))
+    sns.barplot(data=counts, y=category, x='count', hue=hue, palette='viridis', orient='h')
+    plt.title(title)
+    plt.savefig(path)
+    plt.close()
+
+def render_line(path, x, y, title, ylabel):
+
+    plt, _ = _figure(path, (12, 6))
+    plt.plot(x, y, marker='o')
+    plt.title(title)
+    plt.ylabel(ylabel)
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+def get_render_pool():
+
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=mp.get_context('spawn'),
+                                    initializer=_init_worker)
+    return _pool
+
+def submit_plot(renderer, path, **payload):
+
+    if RENDER_WORKERS <= 0:
+        renderer(path, **payload)
+        return None
+    future = get_render_pool().submit(renderer, path, **payload)
+    _pending.append(future)
+    return future
+
+def wait_for_renders():
+
+    global _pool
+    rendered = 0
+    failed = True
+    try:
+        while _pending:
+            _pending.pop(0).result()
+            rendered += 1
+        failed = False
+    finally:
+        _pending.clear()
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=failed)
+            _pool = None
+    return rendered
+
+def release_render_pool():
+
+    global _pool
+    _pending.clear()
+    if _pool is not None:
+        _pool.shutdown(wait=False)
+        _pool = None
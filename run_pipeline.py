@@ -1,6 +1,7 @@
 
 import sys
 import os
+import argparse
 
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -11,26 +12,53 @@ from hris.analysis.credit import run_credit_analysis
 from hris.analysis.fraud import run_fraud_analysis
 from hris.research.backtesting import run_backtesting
 from hris.reporting.dashboard_prep import generate_hybrid_report
+from hris.utils.profiling import enable_profiling, profile_call
+from hris.utils.rendering import wait_for_renders, release_render_pool
 
-def main():
-    print("=== HRIS System Execution Started ===")
-    
+STAGES = [
+    ('cleaning', run_cleaning_pipeline),
+    ('credit_analysis', run_credit_analysis),
+    ('fraud_analysis', run_fraud_analysis),
+    ('scoring', run_scoring_engine),
+    ('backtesting', run_backtesting),
+    ('hybrid', generate_hybrid_report),
+]
+
+def parse_args(argv=None):
 
-    run_cleaning_pipeline()
-    
+    parser = argparse.ArgumentParser(description="Run the HRIS pipeline end to end.")
+    parser.add_argument('--profile', type=lambda v: v.split(','), default=[],
+                        help="Comma separated stages or scored functions to profile, e.g. "
+                             "'scoring' or 'compute_transaction_risk_score'. Use 'all' for every stage. "
+                             f"Stages: {', '.join(name for name, _ in STAGES)}")
+    parser.add_argument('--profile-mode', choices=['sample', 'cprofile'], default='sample')
+    parser.add_argument('--profile-interval', type=float, default=0.005,
+                        help="Sampling interval in seconds for --profile-mode sample")
+    parser.add_argument('--profile-top', type=int, default=25)
+    parser.add_argument('--credit-chunksize', type=int,
+                        help="Stream the credit analysis over chunks of this many rows instead of loading it whole")
+    parser.add_argument('--no-plot-wait', action='store_true',
+                        help="Do not block on the background plot renders before reporting completion")
+    return parser.parse_args(argv)
 
-    run_credit_analysis()
-    run_fraud_analysis()
-    
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile:
+        enable_profiling(args.profile, mode=args.profile_mode, interval=args.profile_interval, top=args.profile_top)
+
+    print("=== HRIS System Execution Started ===")
 
-    run_scoring_engine()
-    
+    stage_options = {'credit_analysis': {'chunksize': args.credit_chunksize}}
+    for name, stage in STAGES:
+        profile_call(name, stage, **stage_options.get(name, {}))
 
-    run_backtesting()
-    
+    if args.no_plot_wait:
+        release_render_pool()
+        print("Plot rendering continues in the background.")
+    else:
+        rendered = wait_for_renders()
+        print(f"Rendered {rendered} plots.")
 
-    generate_hybrid_report()
-    
     print("=== HRIS System Execution Completed Successfully ===")
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _transactions(n=400, seconds=2 * 86400, seed=0):
+    rng = np.random.default_rng(seed)
+    time = np.sort(rng.integers(0, seconds, n)).astype(float)
+    return pd.DataFrame({
+        'Time': time,
+        'Amount': rng.exponential(50, n).round(2),
+        'Class': (rng.random(n) < 0.05).astype(int),
+        'transaction_hour': (time // 3600) % 24,
+        'is_high_risk_merchant': (rng.random(n) < 0.1).astype(int),
+        'City': rng.choice(['Paris', 'Tokyo', 'London'], n),
+        'CustomerID': rng.integers(0, 40, n)
+    })
+
+
+@pytest.fixture
+def make_transactions():
+    return _transactions
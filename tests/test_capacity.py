@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hris.reporting.capacity import ScoreLadder, capacity_report, capacity_summary
+
+
+def brute_force_cutoff(scores, capacity):
+    for cutoff in np.unique(scores):
+        volume = int((scores >= cutoff).sum())
+        if volume <= capacity:
+            return cutoff, volume
+    return None, 0
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_cutoff_for_capacity_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 20, size=rng.integers(1, 60)).astype(float)
+    ladder = ScoreLadder(scores)
+    for capacity in range(0, len(scores) + 2):
+        cutoff, volume = ladder.cutoff_for_capacity(capacity)
+        expected_cutoff, expected_volume = brute_force_cutoff(scores, capacity)
+        assert volume == expected_volume == (scores >= cutoff).sum()
+        if expected_cutoff is not None:
+            assert cutoff == expected_cutoff
+        else:
+            assert cutoff > scores.max()
+
+
+def test_volume_matches_brute_force():
+    scores = np.random.default_rng(0).integers(0, 100, 500).astype(float)
+    ladder = ScoreLadder(scores)
+    for cutoff in [-1, 0, 10.5, 50, 99, 100, 150]:
+        assert ladder.volume(cutoff) == (scores >= cutoff).sum()
+
+
+def test_grouped_ladder_and_uniform_cutoff():
+    rng = np.random.default_rng(1)
+    groups = rng.integers(0, 5, 1000)
+    scores = rng.integers(0, 100, 1000).astype(float)
+    ladder = ScoreLadder(scores, groups)
+    table = ladder.group_cutoffs(30)
+    for _, row in table.iterrows():
+        in_group = scores[groups == row['group']]
+        assert (row['cutoff'], row['volume']) == brute_force_cutoff(in_group, 30)
+    cutoff, volume = ladder.uniform_cutoff(30)
+    assert cutoff == table['cutoff'].max()
+    assert volume == max((scores[groups == g] >= cutoff).sum() for g in range(5)) <= 30
+
+
+def test_missing_scores_and_empty_ladders():
+    ladder = ScoreLadder([np.nan, 5.0, np.nan, 7.0])
+    assert ladder.cutoff_for_capacity(1) == (7.0, 1)
+    cutoff, volume = ScoreLadder([]).cutoff_for_capacity(10)
+    assert np.isnan(cutoff) and volume == 0
+
+
+def test_capacity_report_summary():
+    rng = np.random.default_rng(2)
+    credit = pd.DataFrame({'credit_risk_score': rng.integers(0, 100, 300).astype(float),
+                           'SeriousDlqin2yrs': rng.integers(0, 2, 300), 'debt_to_income_ratio': rng.random(300),
+                           'NumberOfTimes90DaysLate': rng.integers(0, 2, 300),
+                           'MonthlyIncome': rng.integers(1000, 9000, 300)})
+    fraud = pd.DataFrame({'fraud_risk_score': rng.integers(0, 100, 400).astype(float),
+                          'relative_day': rng.integers(0, 3, 400)})
+    hybrid = pd.DataFrame({'hybrid_risk_score': rng.integers(0, 100, 200).astype(float)})
+    report = capacity_report(credit, fraud, hybrid, capacity=25)
+    assert set(report['portfolio']) == {'hybrid', 'credit', 'fraud'}
+    assert (report['volume'] <= 25).all()
+    summary = capacity_summary(report).set_index('Metric')['Value']
+    assert summary['Hybrid Reviews at Cutoff'] <= 25
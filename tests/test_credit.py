@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hris.analysis import credit
+from hris.analysis.credit import accumulate_credit_moments, update_risk_segmentation
+from hris.analysis.moments import load_moments, save_moments
+
+
+@pytest.fixture
+def applicants():
+    rng = np.random.default_rng(3)
+    n = 3000
+    df = pd.DataFrame({
+        'SeriousDlqin2yrs': rng.integers(0, 2, n),
+        'age': rng.integers(21, 80, n),
+        'debt_to_income_ratio': rng.exponential(0.5, n),
+        'MonthlyIncome': rng.lognormal(8.5, 0.6, n),
+        'NumberOfOpenCreditLinesAndLoans': rng.integers(0, 20, n),
+        'NumberRealEstateLoansOrLines': rng.integers(0, 4, n),
+        'LoanAmount': rng.uniform(1000, 50000, n),
+        'NumberOfTimes90DaysLate': rng.poisson(0.2, n)
+    })
+    df['MonthlyIncome'] = df['MonthlyIncome'].mask(rng.random(n) < 0.05)
+    return df
+
+
+def assert_same_moments(left, right):
+    assert left.n == right.n
+    np.testing.assert_allclose(left.means(), right.means())
+    np.testing.assert_allclose(left.covariance(), right.covariance())
+    np.testing.assert_allclose(left.min, right.min)
+    np.testing.assert_allclose(left.max, right.max)
+
+
+def test_update_risk_segmentation_matches_full_recompute(applicants, tmp_path, monkeypatch):
+    monkeypatch.setattr(credit, 'DATA_DIR', str(tmp_path))
+    path = str(tmp_path / 'moments.npz')
+    overall, segments = accumulate_credit_moments([applicants.iloc[:1000].copy()])
+    save_moments(path, {'__overall__': overall, **segments})
+    for start in range(1000, len(applicants), 700):
+        summary = update_risk_segmentation(applicants.iloc[start:start + 700].copy(), moments_path=path)
+
+    full_overall, full_segments = accumulate_credit_moments([applicants.copy()])
+    state = load_moments(path)
+    assert_same_moments(state.pop('__overall__'), full_overall)
+    assert sorted(state) == sorted(full_segments)
+    for segment, acc in full_segments.items():
+        assert_same_moments(state[segment], acc)
+    assert summary['Count'].sum() == len(applicants)
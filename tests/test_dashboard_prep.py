@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hris.reporting.dashboard_prep import (build_customer_state, build_hybrid_profiles, load_customer_state,
+                                           patch_profiles, profiles_from_state, refresh_customer_state,
+                                           save_customer_state, state_extends)
+
+
+def scored_frames(n_credit=4000, n_fraud=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    credit = pd.DataFrame({
+        'credit_risk_score': rng.integers(0, 100, n_credit).astype(float),
+        'MonthlyIncome': rng.integers(1000, 20000, n_credit)
+    })
+    fraud = pd.DataFrame({
+        'Time': np.sort(rng.integers(0, 200, n_fraud)).astype(float),
+        'CustomerID': rng.integers(1000, 6000, n_fraud),
+        'fraud_risk_score': rng.integers(0, 100, n_fraud).astype(float),
+        'txn_count_1h': rng.integers(1, 5, n_fraud)
+    })
+    return credit, fraud
+
+
+def incremental_profiles(credit, fraud, credit_rows, fraud_rows, path):
+    first = build_customer_state(credit.iloc[:credit_rows].copy(), fraud.iloc[:fraud_rows])
+    save_customer_state(first, path)
+    state = load_customer_state(path)
+    assert state_extends(state, credit.copy(), fraud)
+    state, dirty = refresh_customer_state(state, credit.copy(), fraud)
+    return patch_profiles(profiles_from_state(first), state, dirty), state
+
+
+@pytest.mark.parametrize('credit_rows, fraud_rows', [(0, 0), (2000, 1000), (3999, 1999), (4000, 2000)])
+def test_incremental_refresh_matches_full_rebuild(tmp_path, credit_rows, fraud_rows):
+    credit, fraud = scored_frames()
+    patched, state = incremental_profiles(credit, fraud, credit_rows, fraud_rows, str(tmp_path / 'state.npz'))
+    full = build_hybrid_profiles(credit.copy(), fraud)
+    pd.testing.assert_frame_equal(patched, full)
+    assert state['fraud_rows'] == len(fraud)
+
+
+def test_refresh_keeps_rows_tied_with_the_watermark(tmp_path):
+    credit, fraud = scored_frames()
+    tie = fraud['Time'].iloc[1000]
+    split = int(np.searchsorted(fraud['Time'], tie)) + 1
+    assert fraud['Time'].iloc[split] == tie
+    patched, _ = incremental_profiles(credit, fraud, 2000, split, str(tmp_path / 'state.npz'))
+    pd.testing.assert_frame_equal(patched, build_hybrid_profiles(credit.copy(), fraud))
+
+
+def test_state_rejects_rewritten_inputs():
+    credit, fraud = scored_frames()
+    state = build_customer_state(credit.copy(), fraud)
+    assert state_extends(state, credit, fraud)
+    assert not state_extends(state, credit.iloc[:-1], fraud)
+    assert not state_extends(state, credit, fraud.iloc[1:])
+    late = fraud.iloc[[0]].assign(Time=fraud['Time'].iloc[0])
+    assert not state_extends(state, credit, pd.concat([fraud, late], ignore_index=True))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from hris.research.evaluation import best_cutoff, cutoff_curve
+
+
+def brute_force_confusion(scores, labels, cutoff):
+    flags = scores >= cutoff
+    fraud = labels == 1
+    return {
+        'alerts': flags.sum(),
+        'true_positives': (flags & fraud).sum(),
+        'false_positives': (flags & ~fraud).sum(),
+        'false_negatives': (~flags & fraud).sum(),
+        'true_negatives': (~flags & ~fraud).sum()
+    }
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cutoff_curve_matches_brute_force_confusion_matrix(seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 101, 500)
+    labels = (rng.random(500) < 0.1).astype(int)
+    curve = cutoff_curve(scores, labels, fp_cost=1.0, fn_cost=25.0)
+    assert list(curve['cutoff']) == list(range(101))
+    for cutoff in range(101):
+        row = curve.iloc[cutoff]
+        expected = brute_force_confusion(scores, labels, cutoff)
+        for name, value in expected.items():
+            assert row[name] == value, (cutoff, name)
+        if expected['alerts']:
+            assert row['precision'] == pytest.approx(expected['true_positives'] / expected['alerts'])
+        else:
+            assert np.isnan(row['precision'])
+        assert row['recall'] == pytest.approx(expected['true_positives'] / labels.sum())
+        assert row['expected_cost'] == expected['false_positives'] + 25.0 * expected['false_negatives']
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_best_cutoff_minimises_brute_force_cost(seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 101, 500)
+    labels = (rng.random(500) < 0.3 * scores / 100).astype(int)
+    costs = []
+    for cutoff in range(101):
+        expected = brute_force_confusion(scores, labels, cutoff)
+        costs.append(expected['false_positives'] * 2.0 + expected['false_negatives'] * 10.0)
+    best = best_cutoff(cutoff_curve(scores, labels, fp_cost=2.0, fn_cost=10.0))
+    assert best['cutoff'] == int(np.argmin(costs))
+    assert best['expected_cost'] == min(costs)
+
+
+def test_cutoff_curve_clips_scores_above_the_maximum():
+    curve = cutoff_curve([100, 150, 20], [1, 1, 0])
+    assert curve.iloc[100]['alerts'] == 2
+    assert curve.iloc[100]['false_negatives'] == 0
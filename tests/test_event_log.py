@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hris.core.event_log import (append_segment, empty_checkpoint, fold_segment, list_segments, load_checkpoint,
+                                 read_segments)
+
+
+@pytest.fixture
+def events(make_transactions):
+    df = make_transactions(n=500)
+    df['fraud_risk_score'] = (df['Amount'] % 100).round()
+    df['risk_band'] = np.where(df['fraud_risk_score'] >= 70, 'High Risk', 'Low Risk')
+    return df
+
+
+def test_append_skips_rows_at_or_before_the_watermark(events, tmp_path):
+    log_dir = str(tmp_path)
+    assert append_segment(events.iloc[:200], log_dir) == 0
+    assert append_segment(events.iloc[100:350], log_dir) == 1
+    assert append_segment(events.iloc[:300], log_dir) is None
+    assert list_segments(log_dir) == [0, 1]
+
+    logged = pd.concat([segment for _, segment in read_segments(log_dir=log_dir)], ignore_index=True)
+    watermark = events['Time'].iloc[199]
+    expected = pd.concat([events.iloc[:200], events.iloc[200:350][events['Time'].iloc[200:350] > watermark]])
+    assert list(logged['Time']) == list(expected['Time'])
+    assert load_checkpoint(log_dir)['watermark'] == events['Time'].iloc[349]
+
+
+def test_checkpoint_fold_matches_a_full_recompute(events, tmp_path):
+    log_dir = str(tmp_path)
+    for start in range(0, len(events), 120):
+        append_segment(events.iloc[start:start + 120], log_dir)
+    state = load_checkpoint(log_dir)
+
+    logged = pd.concat([segment for _, segment in read_segments(log_dir=log_dir)], ignore_index=True)
+    assert state['offset'] == list_segments(log_dir)[-1]
+    assert state['transactions'] == len(logged)
+    assert state['flagged'] == (logged['risk_band'] == 'High Risk').sum()
+    assert state['score_sum'] == pytest.approx(logged['fraud_risk_score'].sum())
+    assert state['confirmed_fraud'] == logged['Class'].sum()
+    assert state['watermark'] == logged['Time'].max()
+
+    replayed = empty_checkpoint()
+    for seq, segment in read_segments(log_dir=log_dir):
+        fold_segment(replayed, seq, segment)
+    assert replayed.pop('score_sum') == pytest.approx(state.pop('score_sum'))
+    assert replayed == state
+
+
+def test_fold_keeps_only_recent_segment_history(events):
+    state = empty_checkpoint()
+    for seq in range(5):
+        fold_segment(state, seq, events.iloc[seq * 10:(seq + 1) * 10], history=3)
+    assert [s['segment'] for s in state['segments']] == [2, 3, 4]
+    assert state['transactions'] == 50
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hris.core.feature_store import FeatureStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with FeatureStore(str(tmp_path / 'features.db')) as store:
+        yield store
+
+
+def test_upsert_then_get_round_trips(store):
+    features = pd.DataFrame({'CustomerID': [1001, 1002], 'fraud_risk_score': [80.0, np.nan],
+                             'last_city': ['Paris', 'Tokyo'], 'ignored': [1, 2]})
+    assert store.upsert(features) == 2
+    row = store.get(1001)
+    assert row['fraud_risk_score'] == 80.0
+    assert row['last_city'] == 'Paris'
+    assert row['credit_risk_score'] is None
+    assert 'ignored' not in row
+    assert store.get(1002)['fraud_risk_score'] is None
+    assert store.get(9999) is None
+
+
+def test_upsert_only_overwrites_the_given_columns(store):
+    store.upsert(pd.DataFrame({'CustomerID': [1001], 'fraud_risk_score': [80.0], 'last_city': ['Paris']}))
+    store.upsert(pd.DataFrame({'CustomerID': [1001], 'hybrid_risk_score': [55.0]}))
+    row = store.get(1001)
+    assert (row['fraud_risk_score'], row['last_city'], row['hybrid_risk_score']) == (80.0, 'Paris', 55.0)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hris.analysis.moments import MomentAccumulator, load_moments, save_moments
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(1000, 4)) * [1, 10, 100, 1000] + [5, 50, 500, 5000], columns=list('abcd'))
+    return df.mask(rng.random(df.shape) < 0.1)
+
+
+def assert_same_moments(left, right):
+    assert left.n == right.n
+    np.testing.assert_allclose(left.means(), right.means())
+    np.testing.assert_allclose(left.covariance(), right.covariance())
+    np.testing.assert_allclose(left.correlation(), right.correlation())
+    np.testing.assert_allclose(left.min, right.min)
+    np.testing.assert_allclose(left.max, right.max)
+
+
+def test_merge_matches_single_pass(frame):
+    single = MomentAccumulator(frame.columns).update(frame)
+    merged = MomentAccumulator(frame.columns)
+    for start in range(0, len(frame), 137):
+        merged.merge(MomentAccumulator(frame.columns).update(frame.iloc[start:start + 137]))
+    assert_same_moments(merged, single)
+
+
+def test_missing_values_are_dropped_per_column(frame):
+    acc = MomentAccumulator(frame.columns).update(frame)
+    np.testing.assert_allclose(acc.means(), frame.mean())
+    np.testing.assert_allclose(acc.covariance(), frame.cov())
+    np.testing.assert_allclose(acc.correlation(), frame.corr())
+
+
+def test_save_and_load_round_trip(frame, tmp_path):
+    acc = MomentAccumulator(frame.columns).update(frame)
+    path = tmp_path / 'moments.npz'
+    save_moments(str(path), {'all': acc})
+    assert_same_moments(load_moments(str(path))['all'], acc)
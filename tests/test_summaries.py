@@ -0,0 +1,24 @@
+import numpy as np
+
+from hris.analysis.summaries import scatter_density
+
+
+def test_scatter_density_outliers_are_sparse_cells_inside_range():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(0.5, 0.05, 5000), [0.05, 0.95], np.full(50, 10.0)])
+    y = np.concatenate([rng.normal(50, 2, 5000), [5.0, 95.0], np.full(50, 50.0)])
+    counts, x_edges, y_edges, outliers = scatter_density(x, y, bins=20, x_range=(0, 1), y_range=(0, 100))
+
+    assert counts.sum() == 5002
+    assert {5000, 5001} <= set(outliers)
+    assert np.all(x[outliers] <= x_edges[-1])
+    ix = np.searchsorted(x_edges, x[outliers], side='right') - 1
+    iy = np.searchsorted(y_edges, y[outliers], side='right') - 1
+    assert np.all(counts[np.clip(ix, 0, 19), np.clip(iy, 0, 19)] <= 1)
+
+
+def test_scatter_density_caps_outliers_at_sparsest_points():
+    x = np.arange(100, dtype=float)
+    counts, _, _, outliers = scatter_density(x, x, bins=10, outlier_count=100, max_outliers=5)
+    assert len(outliers) == 5
+    assert counts.sum() == 100
@@ -0,0 +1,34 @@
+import os
+
+import pandas as pd
+import pytest
+
+from hris.core.timeline import KEEP_VERSIONS, CustomerTimeline, build_timeline, current_version
+
+
+@pytest.fixture
+def transactions(make_transactions):
+    df = make_transactions(n=600)
+    df['fraud_risk_score'] = (df['Amount'] % 100).round()
+    return df.sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def test_history_matches_pandas_filter(transactions, tmp_path):
+    build_timeline(transactions, str(tmp_path))
+    timeline = CustomerTimeline(str(tmp_path))
+    for customer_id in range(-2, transactions['CustomerID'].max() + 3):
+        expected = transactions[transactions['CustomerID'] == customer_id].sort_values('Time', kind='stable')
+        got = timeline.frame(customer_id)
+        pd.testing.assert_frame_equal(got, expected.reset_index(drop=True), check_dtype=False)
+        history = timeline.history(customer_id, ['Time', 'Amount'])
+        assert list(history['Amount']) == list(expected['Amount'])
+
+
+def test_rebuild_swaps_the_pointer_and_prunes_old_versions(transactions, tmp_path):
+    for i in range(KEEP_VERSIONS + 2):
+        build_timeline(transactions.iloc[:100 * (i + 1)], str(tmp_path))
+    versions = sorted(name for name in os.listdir(tmp_path) if name.startswith('v'))
+    assert len(versions) == KEEP_VERSIONS
+    assert current_version(str(tmp_path)) == os.path.join(str(tmp_path), versions[-1])
+    timeline = CustomerTimeline(str(tmp_path))
+    assert timeline.offsets[-1] == 100 * (KEEP_VERSIONS + 2)
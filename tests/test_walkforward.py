@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from hris.research.walkforward import RollingQuantiles, walk_forward
+
+
+@pytest.mark.parametrize('q', [0.0, 0.5, 0.95, 0.99, 1.0])
+def test_rolling_quantiles_match_numpy(q):
+    values = np.random.default_rng(1).integers(0, 50, 1000).astype(float)
+    window = RollingQuantiles(values)
+    window.add(0, 600)
+    window.remove(0, 200)
+    window.add(600, 800)
+    assert window.quantile(q) == pytest.approx(np.quantile(values[200:800], q))
+
+
+def test_rolling_quantiles_empty_window_is_nan():
+    window = RollingQuantiles(np.arange(10.0))
+    assert np.isnan(window.quantile(0.5))
+
+
+def test_walk_forward_span_shorter_than_training_window(make_transactions):
+    summary = walk_forward(make_transactions(), bucket_seconds=86400, train_buckets=24)
+    assert summary.empty
+
+
+def test_walk_forward_steps_cover_each_test_bucket(make_transactions):
+    summary = walk_forward(make_transactions(), bucket_seconds=3600, train_buckets=24)
+    assert list(summary['test_start']) == list(range(24 * 3600, 48 * 3600, 3600))
+    assert summary['txns'].sum() == (make_transactions()['Time'] >= 24 * 3600).sum()
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import hris.core.rule_hits as rule_hits
+from hris.core.engine import (CREDIT_RULES, FRAUD_RULES, HIGH_RISK_CUTOFF, MEDIUM_RISK_CUTOFF,
+                              compute_credit_risk_score, compute_transaction_risk_score)
+from hris.reporting.whatif import BAND_LABELS, band_counts, load_rule_patterns
+
+
+def credit_applicants(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'debt_to_income_ratio': rng.random(n),
+        'emi_to_income_ratio': rng.random(n),
+        'NumberOfOpenCreditLinesAndLoans': rng.integers(0, 3, n),
+        'NumberRealEstateLoansOrLines': rng.integers(0, 2, n),
+        'MonthlyIncome': rng.integers(1000, 10000, n).astype(float),
+        'LoanAmount': rng.integers(1000, 50000, n).astype(float)
+    })
+
+
+@pytest.fixture
+def published(tmp_path, monkeypatch):
+    monkeypatch.setattr(rule_hits, 'DATA_DIR', str(tmp_path))
+
+    def publish(portfolio, hits, rules):
+        rule_hits.publish_rule_hits(portfolio, hits, rules, HIGH_RISK_CUTOFF, MEDIUM_RISK_CUTOFF)
+        return load_rule_patterns(rule_hits.rule_hits_path(portfolio))
+    return publish
+
+
+def expected_counts(scored):
+    return scored['risk_band'].value_counts().reindex(BAND_LABELS, fill_value=0).to_numpy()
+
+
+def test_production_weights_reproduce_credit_bands(published):
+    scored, hits = compute_credit_risk_score(credit_applicants(), return_hits=True)
+    patterns = published('credit', hits, CREDIT_RULES)
+    counts = band_counts(patterns['patterns'], patterns['counts'], patterns['weights'], HIGH_RISK_CUTOFF,
+                         MEDIUM_RISK_CUTOFF)
+    np.testing.assert_array_equal(counts, expected_counts(scored))
+    assert patterns['counts'].sum() == len(scored)
+
+
+def test_production_weights_reproduce_fraud_bands(published, make_transactions):
+    scored, hits = compute_transaction_risk_score(make_transactions(2000), return_hits=True)
+    patterns = published('fraud', hits, FRAUD_RULES)
+    counts = band_counts(patterns['patterns'], patterns['counts'], patterns['weights'], HIGH_RISK_CUTOFF,
+                         MEDIUM_RISK_CUTOFF)
+    np.testing.assert_array_equal(counts, expected_counts(scored))
+
+
+def test_zero_weights_put_everything_in_low_band(published):
+    scored, hits = compute_credit_risk_score(credit_applicants(), return_hits=True)
+    patterns = published('credit', hits, CREDIT_RULES)
+    counts = band_counts(patterns['patterns'], patterns['counts'], np.zeros(len(CREDIT_RULES)), HIGH_RISK_CUTOFF,
+                         MEDIUM_RISK_CUTOFF)
+    np.testing.assert_array_equal(counts, [len(scored), 0, 0])